@@ -0,0 +1,112 @@
+"""Generate Manim scripts for many description files in one process.
+
+    python batch_generate.py descriptions/ --out-dir generated --workers 8
+    python batch_generate.py "topics/*.txt" --out-dir generated
+
+Every input file becomes '<out-dir>/<stem>.py'. Jobs share one GrokClient:
+one async client and one keep-alive (HTTP/2 when available) connection pool,
+with at most --workers requests in flight. This avoids paying process
+start-up and a TLS handshake per topic. A per-job latency/token summary,
+followed by percentiles over the batch (see telemetry.py), is printed and
+saved as '<out-dir>/summary.json'.
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+
+from grok4call import build_prompt
+from grok_client import GrokClient
+from rate_limit import REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE, RequestScheduler
+from response_cache import CACHE_DIR, ResponseCache
+from scene_prompts import extract_code
+from telemetry import format_summary, summarize
+
+WORKERS = 8
+
+
+def find_inputs(pattern):
+    """Expand a directory (every *.txt inside it) or a glob into input files."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.txt')
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def output_path(input_path, out_dir):
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(out_dir, stem + '.py')
+
+
+async def run_job(input_path, out_dir, grok):
+    result = {'input': input_path, 'output': output_path(input_path, out_dir)}
+    start = time.perf_counter()
+    try:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            description = f.read()
+        content, stats = await grok.complete(build_prompt(description))
+        with open(result['output'], 'w', encoding='utf-8') as f:
+            f.write(extract_code(content))
+        result.update(stats)
+    except Exception as exc:
+        result['error'] = f"{type(exc).__name__}: {exc}"
+    result['wall_time'] = time.perf_counter() - start
+    return result
+
+
+async def run_batch(inputs, out_dir, workers=WORKERS, cache=None, scheduler=None):
+    """Generate a script per input file; returns one result dict per job, in input order."""
+    os.makedirs(out_dir, exist_ok=True)
+    async with GrokClient(max_in_flight=workers, cache=cache, scheduler=scheduler) as grok:
+        return await asyncio.gather(*(run_job(path, out_dir, grok) for path in inputs))
+
+
+def print_summary(results, elapsed):
+    print(f"{'input':<40} {'latency':>8} {'prompt':>7} {'compl.':>7}  status")
+    for result in results:
+        if 'error' in result:
+            status = result['error']
+        else:
+            status = 'cached' if result['cache_hit'] else result['finish_reason']
+        print(f"{os.path.basename(result['input']):<40} {result['wall_time']:>7.1f}s "
+              f"{result.get('prompt_tokens', 0):>7} {result.get('completion_tokens', 0):>7}  {status}")
+    tokens = sum(result.get('completion_tokens', 0) for result in results)
+    failed = sum('error' in result for result in results)
+    print(f"\n{len(results)} jobs ({failed} failed) in {elapsed:.1f}s, "
+          f"{tokens} completion tokens ({tokens / elapsed if elapsed else 0:.1f} tokens/s overall)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Manim scripts for a batch of description files.")
+    parser.add_argument('inputs', help="directory of .txt descriptions or a glob such as 'topics/*.txt'")
+    parser.add_argument('--out-dir', default='generated', help="directory for the generated scripts")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="maximum concurrent requests")
+    parser.add_argument('--rpm', type=int, default=REQUESTS_PER_MINUTE, help="requests per minute allowed")
+    parser.add_argument('--tpm', type=int, default=TOKENS_PER_MINUTE, help="tokens per minute allowed")
+    parser.add_argument('--no-cache', action='store_true', help="always call the API, ignoring cached responses")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="response cache directory")
+    args = parser.parse_args()
+
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        print(f"Error: no description files match '{args.inputs}'")
+        exit(1)
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+
+    start = time.perf_counter()
+    scheduler = RequestScheduler(args.rpm, args.tpm)
+    results = asyncio.run(run_batch(inputs, args.out_dir, args.workers, cache, scheduler))
+    elapsed = time.perf_counter() - start
+    print_summary(results, elapsed)
+    print(format_summary(summarize(results)))
+
+    summary_path = os.path.join(args.out_dir, 'summary.json')
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump({'elapsed': elapsed, 'jobs': results}, f, indent=2)
+    print(f"Summary saved to '{summary_path}'")
+
+
+if __name__ == '__main__':
+    main()
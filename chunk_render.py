@@ -0,0 +1,193 @@
+"""Render one long scene method in frame-range chunks across processes.
+
+parallel_render gives every scene method its own process, so the longest
+scene (scene_1_intro_title) sets the wall time. This splits a single scene
+method's frames into N contiguous ranges and renders each range in its own
+process:
+
+1. A counting pass runs the scene without drawing or encoding its frames,
+   to learn how many frames it writes.
+2. Each chunk process replays the scene from the start. Before its range,
+   every frame still advances mobject state (animations, updaters, camera)
+   through update_to_time, but nothing is drawn. Frames inside the range are
+   drawn and piped to ffmpeg. After the range, the scene ends early.
+3. The chunk clips are joined losslessly.
+
+Because the state at a frame depends only on the frames before it, the
+fast-forward lands every chunk exactly where the previous one stopped.
+Chunk boundaries can fall inside a play() or wait(). Random draws match
+across chunks because scenes draw from scene_rng, and the global RNGs are
+reseeded per scene method (see parallel_render.partial_scene_class).
+
+    python chunk_render.py quantum_field_theory_clean.py QuantumFieldTheoryAnimation scene_1_intro_title -n 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from parallel_render import QUALITIES, _render_config, concat_clips, partial_scene_class, plan_jobs
+
+
+class ChunkEncoder:
+    """Pipes RGBA frames to ffmpeg; started on the first frame, when the size is known."""
+
+    def __init__(self, path, frame_rate):
+        self.path = path
+        self.frame_rate = frame_rate
+        self.process = None
+        self.frames = 0
+
+    def write(self, frame, count=1):
+        import numpy as np
+
+        if self.process is None:
+            height, width = frame.shape[:2]
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.process = subprocess.Popen(
+                ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                 "-s", f"{width}x{height}", "-r", str(self.frame_rate), "-i", "-",
+                 "-c:v", "libx264", "-pix_fmt", "yuv420p", self.path],
+                stdin=subprocess.PIPE)
+        data = np.ascontiguousarray(frame).tobytes()
+        for _ in range(count):
+            self.process.stdin.write(data)
+        self.frames += count
+
+    def close(self):
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed writing '{self.path}'")
+
+
+class FrameGate:
+    """Lets only frames [start, end) of a scene's rendered section be drawn and encoded.
+
+    With no encoder, nothing is drawn and the gate just counts frames.
+    """
+
+    def __init__(self, start=0, end=None, encoder=None):
+        self.start = start
+        self.end = end
+        self.encoder = encoder
+        self.index = 0
+
+    def _in_range(self):
+        return (self.encoder is not None and self.index >= self.start
+                and (self.end is None or self.index < self.end))
+
+    def install(self, scene):
+        from manim.utils.exceptions import EndSceneEarlyException
+
+        renderer = scene.renderer
+        render = renderer.render
+
+        def gated_render(scene, time, moving_mobjects):
+            if renderer.skip_animations:
+                return render(scene, time, moving_mobjects)
+            if self.end is not None and self.index >= self.end:
+                raise EndSceneEarlyException()
+            if not self._in_range():
+                # What add_frame() would do, minus drawing and writing the frame
+                renderer.time += 1 / renderer.camera.frame_rate
+                self.index += 1
+                return
+            render(scene, time, moving_mobjects)
+
+        def gated_write(frame, num_frames=1):
+            first, last = self.index, self.index + num_frames
+            self.index = last
+            if self.encoder is not None:
+                count = min(last, self.end if self.end is not None else last) - max(first, self.start)
+                if count > 0:
+                    self.encoder.write(frame, count)
+            if self.end is not None and self.index >= self.end:
+                raise EndSceneEarlyException()
+
+        renderer.render = gated_render
+        renderer.file_writer.write_frame = gated_write
+
+
+def _run_gated(job, gate):
+    from manim import tempconfig
+
+    # Frames go through the gate only; Manim writes no partial movie files
+    options = _render_config(job.quality, job.media_dir, job.tex_dir, write_to_movie=False,
+                             save_last_frame=False, disable_caching=True)
+    # Loaded before tempconfig, as in render_scene_job, so the script's own config can't override job.quality
+    scene_cls = partial_scene_class(job)
+    with tempconfig(options):
+        scene = scene_cls()
+        gate.install(scene)
+        if gate.encoder is not None:
+            gate.encoder.frame_rate = scene.renderer.camera.frame_rate
+        scene.render()
+    return gate
+
+
+def count_frames(job):
+    """Number of frames job.method writes, without drawing any of them."""
+    return _run_gated(job, FrameGate()).index
+
+
+def render_chunk(job, start, end, output):
+    """Render frames [start, end) of job.method into `output`."""
+    encoder = ChunkEncoder(output, None)
+    try:
+        _run_gated(job, FrameGate(start, end, encoder))
+    finally:
+        encoder.close()
+    return output
+
+
+def chunk_ranges(total, chunks):
+    bounds = [round(total * i / chunks) for i in range(chunks + 1)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def render_chunked(script, class_name, method, chunks=None, quality="high_quality", media_dir="media",
+                   output=None):
+    """Render one scene method split over `chunks` processes and join the pieces."""
+    jobs = {job.method: job for job in plan_jobs(script, class_name, quality, media_dir)}
+    if method not in jobs:
+        raise KeyError(f"{class_name} has no scene method {method}")
+    job = jobs[method]
+    chunks = chunks or os.cpu_count()
+    total = count_frames(job)
+    ranges = chunk_ranges(total, chunks)
+    if not ranges:
+        raise ValueError(f"{method} writes no frames")
+
+    chunk_dir = os.path.join(media_dir, "chunks", f"{class_name}_{method}")
+    outputs = [os.path.join(chunk_dir, f"chunk_{n:03d}.mp4") for n in range(len(ranges))]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(ranges), mp_context=context) as pool:
+        clips = list(pool.map(render_chunk, [job] * len(ranges), *zip(*ranges), outputs))
+
+    module_name = os.path.splitext(os.path.basename(script))[0]
+    output = output or os.path.join(media_dir, "videos", module_name, f"{class_name}_{method}_chunked.mp4")
+    return concat_clips(clips, output), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render one scene method in frame-range chunks across processes.")
+    parser.add_argument('script', help="Manim script, e.g. quantum_field_theory_clean.py")
+    parser.add_argument('scene', help="Scene class, e.g. QuantumFieldTheoryAnimation")
+    parser.add_argument('method', help="scene method, e.g. scene_1_intro_title")
+    parser.add_argument('-n', '--chunks', type=int, default=os.cpu_count(), help="chunks (and processes)")
+    parser.add_argument('-q', '--quality', default="high_quality", choices=QUALITIES)
+    parser.add_argument('-o', '--output', help="output video path")
+    parser.add_argument('--media-dir', default="media")
+    args = parser.parse_args()
+
+    output, total = render_chunked(args.script, args.scene, args.method, args.chunks, args.quality,
+                                   args.media_dir, args.output)
+    print(f"Rendered {args.method} ({total} frames in {min(args.chunks, total)} chunks) to '{output}'")
+
+
+if __name__ == '__main__':
+    main()
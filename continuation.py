@@ -0,0 +1,77 @@
+"""Resume completions that stopped at max_tokens.
+
+A reply whose finish_reason is "length" ends wherever the token budget ran
+out, usually mid-method. Rather than keep that, the client:
+
+1. drops the cut-off last line, keeping the text up to the last newline
+2. sends the original prompt, the kept text as the assistant's turn, and a
+   request to carry on from the next line
+3. appends the reply to the kept text, dropping a reopened code fence or
+   any lines repeated from the end of the kept text
+
+and repeats until the reply finishes normally or MAX_CONTINUATIONS
+follow-ups have been spent. complete_with_continuations() runs that loop
+for both GrokClient.complete() and grok4call.generate_streaming().
+"""
+
+MAX_CONTINUATIONS = 3
+SUMMED_STATS = ('total_latency', 'prompt_tokens', 'completion_tokens')
+MAX_OVERLAP_LINES = 20
+FENCE = "```"
+
+CONTINUE_PROMPT = """Your reply was cut off by the length limit. Continue it exactly from the line after the last one you wrote. Do not repeat anything already written, do not restart the code block, and do not add any commentary before the continuation."""
+
+
+def complete_lines(text):
+    """`text` up to and including its last newline (the last line may be cut short)."""
+    end = text.rfind('\n')
+    return text[:end + 1] if end >= 0 else ''
+
+
+def continuation_messages(prompt, head):
+    return [
+        {"role": "user", "content": prompt},
+        {"role": "assistant", "content": head},
+        {"role": "user", "content": CONTINUE_PROMPT},
+    ]
+
+
+def stitch(head, more):
+    """Join a continuation onto the complete lines of the truncated reply."""
+    lines = more.splitlines(keepends=True)
+    # Inside an open code block, a continuation that starts with a fresh fence would close it
+    if head.count(FENCE) % 2 == 1 and lines and lines[0].lstrip().startswith(FENCE):
+        lines = lines[1:]
+
+    tail = [line.rstrip() for line in head.splitlines()[-MAX_OVERLAP_LINES:]]
+    for size in range(min(len(tail), len(lines)), 0, -1):
+        if [line.rstrip() for line in lines[:size]] == tail[-size:] and any(tail[-size:]):
+            lines = lines[size:]
+            break
+    return head + ''.join(lines)
+
+
+async def complete_with_continuations(prompt, request, max_continuations=MAX_CONTINUATIONS, on_stitch=None):
+    """Complete `prompt`, continuing the reply while it stops at max_tokens.
+
+    `request(messages, n)` is an async callable returning (content, stats)
+    for request n (0 for the original prompt). stats needs finish_reason and
+    the SUMMED_STATS fields. Returns the stitched content and the first
+    request's stats, with SUMMED_STATS summed over all requests, the last
+    finish_reason, and the number of continuations. `on_stitch(content)` is
+    called after each continuation is joined on.
+    """
+    content, stats = await request([{"role": "user", "content": prompt}], 0)
+    stats['continuations'] = 0
+    while stats['finish_reason'] == 'length' and stats['continuations'] < max_continuations:
+        head = complete_lines(content)
+        n = stats['continuations'] + 1
+        more, more_stats = await request(continuation_messages(prompt, head), n)
+        content = stitch(head, more)
+        if on_stitch is not None:
+            on_stitch(content)
+        for name in SUMMED_STATS:
+            stats[name] += more_stats[name]
+        stats['finish_reason'] = more_stats['finish_reason']
+        stats['continuations'] = n
+    return content, stats
@@ -0,0 +1,341 @@
+"""Vectorized mobjects for the QFT animation scenes.
+
+Building a star field as VGroup(*[Dot(...) for _ in range(200)]) gives 200
+VMobjects, each with its own Bezier point array, and every fade or pan
+interpolates them one by one. The components here keep their state in a few
+NumPy arrays so a per-frame update is a handful of array operations
+regardless of how many elements they draw.
+"""
+
+import types
+from collections import OrderedDict
+
+import numpy as np
+from manim import BLUE, PI, PMobject, Mobject, RED, TAU, VGroup, VMobject, WHITE, color_to_rgba
+
+CURVE_CACHE_SIZE = 256
+
+
+class _StarTier(PMobject):
+    """The stars of one size tier, drawn with a single stroke width.
+
+    The opacity and twinkle state lives here rather than on the StarField,
+    because Transform and .animate interpolate the tiers (the mobjects with
+    points), never the field itself.
+    """
+
+    def __init__(self, points, rgb, brightness, phases, **kwargs):
+        super().__init__(**kwargs)
+        self.points = points
+        self.base_rgb = np.asarray(rgb, dtype=float)
+        self.star_brightness = brightness
+        self.star_phases = phases
+        self.opacity = 1.0
+        self.twinkle_amplitude = 0.0
+        self.rgbas = np.ones((len(points), 4))
+
+    def update_colors(self, time=0.0, speed=0.0):
+        level = self.star_brightness * self.opacity
+        if self.twinkle_amplitude:
+            wave = 0.5 + 0.5 * np.sin(self.star_phases + speed * time)
+            level = level * (1 - self.twinkle_amplitude * wave)
+        # The camera copies point colours into the frame without blending, so
+        # alpha would be lost: dim the RGB towards black, as PMobject.fade_to does
+        self.rgbas[:, :3] = level[:, None] * self.base_rgb
+        self.rgbas[:, 3] = 1.0
+        return self
+
+    def interpolate_color(self, mobject1, mobject2, alpha):
+        super().interpolate_color(mobject1, mobject2, alpha)
+        self.opacity = mobject1.opacity + alpha * (mobject2.opacity - mobject1.opacity)
+        self.twinkle_amplitude = (mobject1.twinkle_amplitude
+                                  + alpha * (mobject2.twinkle_amplitude - mobject1.twinkle_amplitude))
+
+
+class StarField(Mobject):
+    """A point-cloud star field with per-star size and brightness.
+
+    The camera draws every point of a PMobject with a single stroke width, so
+    stars are grouped into `n_tiers` size tiers, each one PMobject holding the
+    positions and colours of its stars in one array. Opacity fades, pans and
+    twinkling therefore cost one array update per tier per frame instead of
+    one per star.
+
+    Positions, sizes, brightness and twinkle phases are drawn from `rng`
+    (default: numpy's global RNG); pass scene_rng.scene_rng(...) for a
+    reproducible field.
+    """
+
+    def __init__(self, n_stars=200, extent=7, size_range=(2, 8), brightness_range=(0.4, 1.0),
+                 n_tiers=3, color=WHITE, rng=None, **kwargs):
+        super().__init__(**kwargs)
+        rng = np.random if rng is None else rng
+        points = rng.uniform(-extent, extent, size=(n_stars, 3))
+        self.sizes = rng.uniform(*size_range, n_stars)
+        self.brightness = rng.uniform(*brightness_range, n_stars)
+        self.phases = rng.uniform(0, TAU, n_stars)
+        self.twinkle_speed = 0.0
+        self.time = 0.0
+
+        edges = np.linspace(size_range[0], size_range[1], n_tiers + 1)
+        tier_of_star = np.digitize(self.sizes, edges[1:-1])
+        rgb = color_to_rgba(color)[:3]
+        for i in range(n_tiers):
+            mask = tier_of_star == i
+            if mask.any():
+                self.add(_StarTier(points[mask], rgb, self.brightness[mask], self.phases[mask],
+                                   stroke_width=(edges[i] + edges[i + 1]) / 2))
+        self._update_colors()
+
+    def _update_colors(self):
+        for tier in self.submobjects:
+            tier.update_colors(self.time, self.twinkle_speed)
+        return self
+
+    def set_opacity(self, opacity, family=True):
+        for tier in self.submobjects:
+            tier.opacity = opacity
+        return self._update_colors()
+
+    def fade(self, darkness=0.5, family=True):
+        for tier in self.submobjects:
+            tier.opacity *= 1 - darkness
+        return self._update_colors()
+
+    def start_twinkling(self, amplitude=0.5, speed=3.0):
+        """Modulate each star's brightness with its own phase, every frame."""
+        for tier in self.submobjects:
+            tier.twinkle_amplitude = amplitude
+        self.twinkle_speed = speed
+
+        def twinkle(mob, dt):
+            mob.time += dt
+            mob._update_colors()
+
+        self.add_updater(twinkle)
+        return self
+
+    def stop_twinkling(self):
+        self.clear_updaters()
+        for tier in self.submobjects:
+            tier.twinkle_amplitude = 0.0
+        return self._update_colors()
+
+
+_curve_cache = OrderedDict()
+
+
+def _sample_times(t_range):
+    # ParametricFunction's (t_min, t_max[, step]) convention, always ending on t_max
+    t_min, t_max, step = (*t_range, 0.01) if len(t_range) == 2 else t_range
+    return np.append(np.arange(t_min, t_max, step), t_max)
+
+
+def _evaluate(function, t, *args):
+    """function(t, *args) over the whole t array, as an (n, 3) array of points.
+
+    The function may return an (n, 3) or (3, n) array, or three components,
+    each an array or a scalar, e.g. lambda t: (t, np.sin(2 * t), 0).
+    """
+    result = function(t, *args)
+    if isinstance(result, (tuple, list)):
+        return np.stack(np.broadcast_arrays(*result[:3], t)[:3], axis=1).astype(float)
+    result = np.asarray(result, dtype=float)
+    if result.shape == (3, len(t)) and len(t) != 3:
+        result = result.T
+    return result
+
+
+def _bezier_points(points):
+    """Smooth cubic Bezier points through `points` (Catmull-Rom handles), in one pass.
+
+    `points` is (n, 3), or (..., n, 3) for several curves at once.
+    """
+    tangents = np.gradient(points, axis=-2)
+    starts, ends = points[..., :-1, :], points[..., 1:, :]
+    handles = np.stack([starts, starts + tangents[..., :-1, :] / 3, ends - tangents[..., 1:, :] / 3, ends],
+                       axis=-2)
+    return handles.reshape(*points.shape[:-2], -1, 3)
+
+
+def _line_points(starts, ends):
+    """Bezier points for the straight segments starts[i] -> ends[i], over the last two axes."""
+    delta = ends - starts
+    segments = np.stack([starts, starts + delta / 3, ends - delta / 3, ends], axis=-2)
+    return segments.reshape(*starts.shape[:-2], -1, 3)
+
+
+_SCALARS = (bool, int, float, complex, str, bytes, type(None))
+
+
+def _function_key(function):
+    """A cache key for `function`'s samples, or None when they may not repeat.
+
+    Only self-contained functions are keyed, on their code object: no
+    closure, no nested functions, scalar defaults, and every global they
+    read bound to a module (np, math). Captured objects and other globals
+    can change between calls under the same code, e.g. a ValueTracker read
+    inside always_redraw, so those functions are sampled every time.
+    """
+    code = getattr(function, '__code__', None)
+    if code is None or function.__closure__ or any(isinstance(const, types.CodeType) for const in code.co_consts):
+        return None
+    defaults = (*(function.__defaults__ or ()), *(function.__kwdefaults__ or {}).values())
+    if not all(isinstance(value, _SCALARS) for value in defaults):
+        return None
+    namespace = function.__globals__
+    if not all(isinstance(namespace[name], types.ModuleType) for name in code.co_names if name in namespace):
+        return None
+    return code, function.__defaults__, tuple(sorted((function.__kwdefaults__ or {}).items()))
+
+
+class VectorizedParametricFunction(VMobject):
+    """A ParametricFunction sampled with one vectorized call.
+
+    ParametricFunction calls `function` once per sample point and smooths the
+    result with a tridiagonal solve. Here `function` gets the whole NumPy `t`
+    array at once, and smooth Bezier handles come from a single array pass.
+
+    The sampled points are cached per `t_range`, under `cache_key` if one is
+    given and otherwise under the function's code when it depends on nothing
+    but its argument (see _function_key). Rebuilding the same curve, e.g.
+    when a scene is replayed in another process, then costs a copy. Pass a
+    `cache_key` only if it identifies everything the function reads.
+    """
+
+    def __init__(self, function, t_range=(0, 1), use_cache=True, cache_key=None, **kwargs):
+        self.function = function
+        self.t_range = tuple(t_range)
+        self.use_cache = use_cache
+        self.cache_key = cache_key
+        self.t = _sample_times(self.t_range)
+        super().__init__(**kwargs)
+
+    def sample(self):
+        return _bezier_points(_evaluate(self.function, self.t))
+
+    def generate_points(self):
+        key = None
+        if self.use_cache:
+            key = ('key', self.cache_key) if self.cache_key is not None else _function_key(self.function)
+        if key is None:
+            self.points = self.sample()
+            return self
+        key = (key, self.t_range)
+        if key not in _curve_cache:
+            _curve_cache[key] = self.sample()
+            if len(_curve_cache) > CURVE_CACHE_SIZE:
+                _curve_cache.popitem(last=False)
+        _curve_cache.move_to_end(key)
+        self.points = _curve_cache[key].copy()
+        return self
+
+
+class _Propagating:
+    """Time, placement and propagation for mobjects rebuilt from a function of time.
+
+    Subclasses set `time` and `offset` before Mobject.__init__ and implement
+    set_time(), which rebuilds every point from scratch and adds `offset`.
+    Placement is kept as that offset so shift, move_to and next_to survive
+    the rebuild. Scaling and rotation belong in the function.
+    """
+
+    def shift(self, *vectors):
+        super().shift(*vectors)
+        self.offset = self.offset + np.sum(vectors, axis=0)
+        return self
+
+    def start_propagating(self, speed=1.0):
+        """Advance time by speed * dt every frame."""
+        def propagate(mob, dt):
+            mob.set_time(mob.time + speed * dt)
+
+        self.add_updater(propagate)
+        return self
+
+    def stop_propagating(self):
+        self.clear_updaters()
+        return self
+
+
+class TimeParametricFunction(_Propagating, VectorizedParametricFunction):
+    """A vectorized parametric curve that also depends on time: function(t, time).
+
+    set_time() re-samples the whole curve in one vectorized pass, and
+    start_propagating() does so every frame from an updater.
+    """
+
+    def __init__(self, function, t_range=(0, 1), time=0.0, **kwargs):
+        self.time = time
+        self.offset = np.zeros(3)
+        super().__init__(function, t_range, use_cache=False, **kwargs)
+
+    def sample(self):
+        return _bezier_points(_evaluate(self.function, self.t, self.time) + self.offset)
+
+    def set_time(self, time):
+        self.time = time
+        self.points = self.sample()
+        return self
+
+
+class EMWave(_Propagating, VGroup):
+    """A propagating electromagnetic plane wave: E and B curves with field-vector arrows.
+
+    Both fields travel along x with amplitude * sin(wavenumber * x -
+    angular_frequency * time). E points along y and B along z. Every frame
+    evaluates that sine once for all curve samples and all arrow positions,
+    and one broadcast over a (2, ...) field axis turns it into the points of
+    both fields. The wave is six VMobjects however many arrows it has: a
+    curve per field, plus one VMobject holding every arrow shaft of a field
+    and one holding every arrow head. Adding arrows adds points, not mobjects.
+
+    start_propagating() advances the wave every frame, as for
+    TimeParametricFunction.
+    """
+
+    FIELD_AXES = np.array([[0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])   # E along y, B along z
+
+    def __init__(self, length=TAU, amplitude=1.0, wavenumber=2.0, angular_frequency=PI, n_arrows=16,
+                 step=0.01, tip_length=0.15, e_color=RED, b_color=BLUE, arrow_stroke_width=2, time=0.0,
+                 **kwargs):
+        self.amplitude = amplitude
+        self.wavenumber = wavenumber
+        self.angular_frequency = angular_frequency
+        self.tip_length = tip_length
+        self.time = time
+        self.offset = np.zeros(3)
+        samples = _sample_times((-length / 2, length / 2, step))
+        self.n_samples = len(samples)
+        x = np.concatenate([samples, np.linspace(-length / 2, length / 2, n_arrows + 2)[1:-1]])
+        self.axis_points = np.column_stack([x, np.zeros_like(x), np.zeros_like(x)])
+
+        self.curves = [VMobject(stroke_color=color) for color in (e_color, b_color)]
+        self.shafts = [VMobject(stroke_color=color, stroke_width=arrow_stroke_width) for color in (e_color, b_color)]
+        self.heads = [VMobject(fill_color=color, fill_opacity=1, stroke_width=0) for color in (e_color, b_color)]
+        self.e_curve, self.b_curve = self.curves
+        super().__init__(*self.curves, *self.shafts, *self.heads, **kwargs)
+        self.set_time(time)
+
+    def set_time(self, time):
+        self.time = time
+        n = self.n_samples
+        field = self.amplitude * np.sin(self.wavenumber * self.axis_points[:, 0] - self.angular_frequency * time)
+        origins = self.axis_points + self.offset
+        # (2, samples + arrows, 3): where E and B reach at each x
+        tips = origins + field[:, None] * self.FIELD_AXES[:, None, :]
+
+        curves = _bezier_points(tips[:, :n])
+        values = field[n:, None]
+        ends = tips[:, n:]
+        head = np.minimum(self.tip_length, np.abs(values) / 2)
+        necks = ends - np.sign(values) * head * self.FIELD_AXES[:, None, :]
+        side = head * np.array([0.3, 0.0, 0.0])
+        shafts = _line_points(np.broadcast_to(origins[n:], ends.shape), necks)
+        corners = np.stack([ends, necks + side, necks - side], axis=-2)
+        heads = _line_points(corners, np.roll(corners, -1, axis=-2)).reshape(2, -1, 3)
+
+        for mobs, points in ((self.curves, curves), (self.shafts, shafts), (self.heads, heads)):
+            for mob, field_points in zip(mobs, points):
+                mob.points = field_points
+        return self
@@ -1,31 +1,61 @@
+"""Command-line entry point for generating and checking Manim scripts with Grok.
+
+    python grok4call.py [generate] [--stream | --by-scene | --regenerate] ...
+    python grok4call.py batch descriptions/ --workers 8
+    python grok4call.py analyze|validate|repair manim_quantum_field_theory.py
+    python grok4call.py telemetry
+
+Without a command, the description is converted into a script (generate).
+The other commands hand their arguments to batch_generate, script_analyzer,
+validate_script, repair and telemetry, which are imported only when chosen.
+openai, httpx and Manim are likewise only imported once a request or a dry
+run actually needs them. That keeps --help, cache hits and the start of a
+validation well under a second; startup_benchmark.py measures this.
+"""
+
+import argparse
+import asyncio
+import importlib
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
+import sys
+import time
 
-# Load environment variables
-load_dotenv()
+from continuation import MAX_CONTINUATIONS, complete_with_continuations
+from grok_client import MAX_TOKENS, MODEL, TEMPERATURE, GrokClient, get_api_key, get_base_url
+from rate_limit import RequestScheduler
+from response_cache import CACHE_DIR, ResponseCache, cache_key
+from scene_manifest import changed_scenes, load_manifest, save_manifest, update_script
+from scene_prompts import assemble_script, build_scene_prompt, extract_code, extract_method, split_scenes
+from telemetry import default_log
 
-# Get API key from environment
-XAI_API_KEY = os.getenv('XAI_API_KEY')
+INPUT_FILE = 'universe.txt'
+OUTPUT_FILE = 'manim_quantum_field_theory.py'
+SCENE_CONCURRENCY = 4
 
-if not XAI_API_KEY:
-    raise ValueError("XAI_API_KEY environment variable is not set")
+# command: (module whose main() runs it, help); None is generate, handled here
+COMMANDS = {
+    'generate': (None, "convert a description into a Manim script (default)"),
+    'batch': ('batch_generate', "generate scripts for a directory or glob of descriptions"),
+    'analyze': ('script_analyzer', "check a script's TeX strings and fonts"),
+    'validate': ('validate_script', "compile and dry-run a script"),
+    'repair': ('repair', "repair failing scene methods with Grok"),
+    'telemetry': ('telemetry', "summarize the request telemetry log"),
+}
 
-# Read the universe.txt file
-try:
-    with open('universe.txt', 'r', encoding='utf-8') as file:
-        universe_content = file.read()
-except FileNotFoundError:
-    print("Error: universe.txt file not found!")
-    exit(1)
 
-client = OpenAI(
-  api_key=XAI_API_KEY,
-  base_url="https://api.x.ai/v1",
-)
+def get_client(**kwargs):
+    from openai import OpenAI
 
-# Create the prompt for Grok4 to convert the content to Manim code
-prompt = f"""Please convert the following animation description into a complete, fully rendered Manim Community v.19 Python code. 
+    return OpenAI(
+        api_key=get_api_key(),
+        base_url=get_base_url(),
+        **kwargs,
+    )
+
+
+def build_prompt(universe_content):
+    # Create the prompt for Grok4 to convert the content to Manim code
+    return f"""Please convert the following animation description into a complete, fully rendered Manim Community v.19 Python code.
 
 The description is for a Quantum Field Theory animation with multiple scenes. Please create a complete, runnable Manim script that includes:
 
@@ -43,19 +73,321 @@ Here's the animation description:
 
 Please provide the complete Python code that can be run directly with Manim Community v.19. Make sure to include all necessary imports and create a complete, self-contained script."""
 
-completion = client.chat.completions.create(
-  model="grok-3",
-  messages=[
-    {"role": "user", "content": prompt}
-  ],
-  max_tokens=4000,  # Increased for longer code generation
-  temperature=0.1   # Lower temperature for more focused code generation
-)
 
-print("Response:", completion.choices[0].message.content)
+def complete(prompt, cache=None):
+    """Run one completion, returning (content, stats).
+
+    stats holds the latency, token usage, finish reason and whether the
+    response came from the cache. Transient API failures are retried by
+    GrokClient's scheduler.
+    """
+    async def run():
+        async with GrokClient(max_in_flight=1, cache=cache) as grok:
+            return await grok.complete(prompt)
+
+    return asyncio.run(run())
+
+
+def generate(prompt, cache=None):
+    return complete(prompt, cache)[0]
+
+
+def _record_stream(telemetry, stats, **extra):
+    if telemetry is not None:
+        fields = {'model': MODEL, 'stream': True, 'max_tokens': MAX_TOKENS, 'temperature': TEMPERATURE,
+                  'prompt_tokens': 0, 'finish_reason': None, 'error': None}
+        telemetry.record(**{**fields, **stats, **extra})
+
+
+async def _stream_once(client, scheduler, messages, f, echo, telemetry, continuation=0):
+    """Stream one request, appending its text to the open file `f` (if any).
+
+    The stream is opened through `scheduler`, so it is paced like any other
+    request, and a 429, 5xx or connection error while opening it is retried.
+    Those all arrive before the first token. A stream that breaks after text
+    has arrived is not retried.
+    """
+    async def request():
+        return client.chat.completions.with_raw_response.create(
+            model=MODEL,
+            messages=messages,
+            max_tokens=MAX_TOKENS,
+            temperature=TEMPERATURE,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+    estimated_tokens = sum(len(message["content"]) for message in messages) // 4 + MAX_TOKENS
+    start = time.perf_counter()
+    first_token = None
+    finish_reason = None
+    chunks = 0
+    usage = None
+    pieces = []
+    try:
+        stream = await scheduler.run(request, estimated_tokens)
+        for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            text = chunk.choices[0].delta.content
+            if not text:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter()
+            chunks += 1
+            pieces.append(text)
+            if f is not None:
+                f.write(text)
+                f.flush()
+            if echo:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+    except Exception as exc:
+        now = time.perf_counter()
+        _record_stream(telemetry, {'cache_hit': False, 'completion_tokens': chunks, 'total_latency': now - start,
+                                   'time_to_first_token': first_token - start if first_token else None},
+                       continuation=continuation, error=f"{type(exc).__name__}: {exc}")
+        raise
+
+    scheduler.refund(estimated_tokens, usage)
+    end = time.perf_counter()
+    # Without a usage block each streamed delta is roughly one token
+    completion_tokens = usage.completion_tokens if usage is not None else chunks
+    generation_time = end - (first_token or end)
+    stats = {
+        'cache_hit': False,
+        'time_to_first_token': (first_token or end) - start,
+        'total_latency': end - start,
+        'completion_tokens': completion_tokens,
+        'tokens_per_second': completion_tokens / generation_time if generation_time > 0 else 0.0,
+        'prompt_tokens': usage.prompt_tokens if usage is not None else 0,
+        'finish_reason': finish_reason,
+    }
+    _record_stream(telemetry, stats, continuation=continuation)
+    return ''.join(pieces), stats
+
+
+def generate_streaming(prompt, output_path, client=None, cache=None, echo=True, telemetry=None, scheduler=None):
+    """Stream the completion into output_path as tokens arrive.
+
+    Chunks are appended to '<output_path>.part', which is renamed over
+    output_path only once the stream finishes, so a dropped connection leaves
+    the partial script on disk instead of nothing. A reply cut off at
+    max_tokens is continued from its last complete line (see continuation.py).
+    Returns the content and a dict with time-to-first-token and throughput.
+    Each request is recorded to `telemetry` (default: telemetry.default_log()).
+    Streams are opened through `scheduler` (a RequestScheduler), which paces
+    them and retries a failure to open one.
+    """
+    telemetry = default_log() if telemetry is None else telemetry or None
+    key = cache_key(MODEL, prompt, TEMPERATURE, MAX_TOKENS)
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            if echo:
+                sys.stdout.write(content)
+            stats = {'cache_hit': True, 'time_to_first_token': 0.0, 'total_latency': 0.0,
+                     'completion_tokens': 0, 'tokens_per_second': 0.0, 'continuations': 0}
+            _record_stream(telemetry, stats)
+            return content, stats
+
+    # Retries are the scheduler's job, as in GrokClient
+    client = client or get_client(max_retries=0)
+    scheduler = scheduler or RequestScheduler()
+    partial_path = output_path + '.part'
+    with open(partial_path, 'w', encoding='utf-8') as f:
+        def request(messages, continuation):
+            if continuation and echo:
+                sys.stdout.write("\n\n[cut off at max_tokens; continuing from the last complete line]\n")
+            # Only the first reply streams into the file; continuations are stitched on after
+            return _stream_once(client, scheduler, messages, None if continuation else f, echo, telemetry,
+                                continuation)
+
+        def rewrite(content):
+            f.seek(0)
+            f.truncate()
+            f.write(content)
+            f.flush()
+
+        # The stream is read synchronously; the loop only drives the shared continuation logic
+        content, stats = asyncio.run(complete_with_continuations(prompt, request, on_stitch=rewrite))
+    os.replace(partial_path, output_path)
+    if cache is not None and stats['finish_reason'] != 'length':
+        cache.put(key, content, model=MODEL)
+
+    generation_time = stats['total_latency'] - stats['time_to_first_token']
+    stats['tokens_per_second'] = stats['completion_tokens'] / generation_time if generation_time > 0 else 0.0
+    return content, stats
+
+
+async def generate_scene_methods(scenes, only=None, concurrency=SCENE_CONCURRENCY, cache=None):
+    """Generate the scene methods for `only` (default: every scene) concurrently.
+
+    At most `concurrency` completions are in flight at once; scenes whose
+    prompt is already cached are not requested at all. Returns
+    {method_name: method source}.
+    """
+    targets = scenes if only is None else only
+    prompts = [build_scene_prompt(scene, scenes) for scene in targets]
+    async with GrokClient(max_in_flight=concurrency, cache=cache) as grok:
+        results = await grok.complete_many(prompts)
+    return {scene.method_name: extract_method(extract_code(reply), scene.method_name)
+            for scene, (reply, _) in zip(targets, results)}
+
+
+async def generate_scenes(description, concurrency=SCENE_CONCURRENCY, cache=None):
+    """Generate one scene method per "Scene N" heading and assemble the script.
+
+    Returns (scenes, {method_name: source}, script).
+    """
+    scenes = split_scenes(description)
+    if not scenes:
+        raise ValueError("No 'Scene N: Title' headings found in the description")
+    methods = await generate_scene_methods(scenes, concurrency=concurrency, cache=cache)
+    script = assemble_script([(scene, methods[scene.method_name]) for scene in scenes])
+    return scenes, methods, script
+
+
+async def regenerate_scenes(description, script_path, concurrency=SCENE_CONCURRENCY, cache=None):
+    """Re-prompt only the scenes whose description changed since the last run.
+
+    The manifest written next to `script_path` holds the description hash
+    behind each method; changed scenes are regenerated and spliced into the
+    existing script. Returns (scenes, methods, script, regenerated scenes).
+    """
+    scenes = split_scenes(description)
+    if not scenes:
+        raise ValueError("No 'Scene N: Title' headings found in the description")
+    with open(script_path, 'r', encoding='utf-8') as f:
+        script = f.read()
+    manifest = load_manifest(script_path)
+    stale = changed_scenes(scenes, manifest, script)
+    new_methods = await generate_scene_methods(scenes, stale, concurrency, cache) if stale else {}
+    script, methods = update_script(script, scenes, new_methods, manifest)
+    return scenes, methods, script, stale
+
+
+def generate_script(universe_content, args, cache):
+    """One-shot generation of the whole script, optionally streamed."""
+    prompt = build_prompt(universe_content)
+
+    if args.stream:
+        print("Response:")
+        try:
+            content, stats = generate_streaming(prompt, args.output, cache=cache)
+        except Exception:
+            print(f"\nStream interrupted; partial output kept in '{args.output}.part'")
+            raise
+        if stats['cache_hit']:
+            print("\n\nServed from the response cache")
+        else:
+            print(f"\n\nTime to first token: {stats['time_to_first_token']:.2f}s, "
+                  f"{stats['completion_tokens']} tokens in {stats['total_latency']:.2f}s "
+                  f"({stats['tokens_per_second']:.1f} tokens/s)")
+    else:
+        content, stats = complete(prompt, cache=cache)
+        print("Response:", content)
+    if stats.get('continuations'):
+        print(f"Continued {stats['continuations']} time(s) after the reply hit max_tokens")
+
+    # Keep only the code block, dropping the Markdown fences and prose around it
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(extract_code(content))
+
+    print(f"\nManim code has been saved to '{args.output}'")
+    if stats.get('finish_reason') == 'length':
+        print(f"Error: the reply was still cut off after {MAX_CONTINUATIONS} continuations; "
+              f"'{args.output}' is incomplete")
+        exit(1)
+
+
+def generate_main(argv=None):
+    program = os.path.basename(sys.argv[0])
+    commands = '\n'.join(f"  {name:<10} {summary}" for name, (_, summary) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog=f"{program} [generate]",
+        description="Convert an animation description into a Manim script with Grok.",
+        epilog=f"commands:\n{commands}\n\nRun '{program} <command> --help' for a command's options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=INPUT_FILE, help="animation description file")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="where to save the generated script")
+    parser.add_argument('--stream', action='store_true',
+                        help="stream the completion and write it to disk incrementally")
+    parser.add_argument('--by-scene', action='store_true',
+                        help="generate one method per 'Scene N' heading concurrently and assemble them")
+    parser.add_argument('--concurrency', type=int, default=SCENE_CONCURRENCY,
+                        help="maximum scene requests in flight with --by-scene")
+    parser.add_argument('--regenerate', action='store_true',
+                        help="only re-prompt scenes whose description changed since the last --by-scene run")
+    parser.add_argument('--no-cache', action='store_true', help="always call the API, ignoring cached responses")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="response cache directory")
+    parser.add_argument('--validate', action='store_true',
+                        help="byte-compile and dry-run the generated script before you render it")
+    parser.add_argument('--repair', type=int, default=0, metavar='N',
+                        help="validate, and send failing scene methods back to the model up to N times")
+    args = parser.parse_args(argv)
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+
+    # Read the universe.txt file
+    try:
+        with open(args.input, 'r', encoding='utf-8') as file:
+            universe_content = file.read()
+    except FileNotFoundError:
+        print(f"Error: {args.input} file not found!")
+        exit(1)
+
+    if args.regenerate and not os.path.exists(args.output):
+        print(f"No existing '{args.output}' to update; generating every scene")
+        args.by_scene, args.regenerate = True, False
+
+    if args.regenerate:
+        scenes, methods, content, stale = asyncio.run(
+            regenerate_scenes(universe_content, args.output, args.concurrency, cache))
+        print("Regenerated:", ", ".join(scene.method_name for scene in stale) or "nothing (no scene changed)")
+    elif args.by_scene:
+        scenes, methods, content = asyncio.run(generate_scenes(universe_content, args.concurrency, cache))
+
+    if args.by_scene or args.regenerate:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(content)
+        save_manifest(args.output, scenes, methods)
+        print(f"Manim code has been saved to '{args.output}'")
+    else:
+        generate_script(universe_content, args, cache)
+
+    if args.repair:
+        from repair import print_report, repair_script
+
+        report = asyncio.run(repair_script(args.output, max_iterations=args.repair))
+        print_report(args.output, report)
+        if not report.ok:
+            exit(1)
+    elif args.validate:
+        from validate_script import format_result, validate
+
+        result = validate(args.output)
+        print(format_result(args.output, result))
+        if not result.ok:
+            exit(1)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv and argv[0] in COMMANDS else 'generate'
+    if argv and argv[0] == command:
+        argv = argv[1:]
+    module_name = COMMANDS[command][0]
+    if module_name is None:
+        return generate_main(argv)
+    # Each command module parses sys.argv itself
+    sys.argv = [f"{os.path.basename(sys.argv[0])} {command}"] + argv
+    return importlib.import_module(module_name).main()
 
-# Optionally save the response to a file
-with open('manim_quantum_field_theory.py', 'w', encoding='utf-8') as f:
-    f.write(completion.choices[0].message.content)
 
-print("\nManim code has been saved to 'manim_quantum_field_theory.py'")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Asyncio generation API for the xAI endpoint.
+
+    import asyncio
+    from grok_client import GrokClient
+
+    async def main(prompts):
+        async with GrokClient(max_in_flight=16) as grok:
+            return await grok.complete_many(prompts)
+
+One GrokClient owns a single AsyncOpenAI client on top of one httpx
+connection pool. HTTP/2 is used when the `h2` package is installed, so
+concurrent requests are multiplexed over a few kept-alive connections.
+Throughput then scales with max_in_flight rather than with the number of
+processes.
+"""
+
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+from continuation import MAX_CONTINUATIONS, complete_with_continuations
+from rate_limit import RequestScheduler
+from response_cache import cache_key
+from telemetry import default_log
+
+MODEL = "grok-3"
+MAX_TOKENS = 4000  # Increased for longer code generation
+TEMPERATURE = 0.1  # Lower temperature for more focused code generation
+BASE_URL = "https://api.x.ai/v1"
+MAX_IN_FLIGHT = 8
+
+
+def get_api_key():
+    # Load environment variables
+    load_dotenv()
+
+    # Get API key from environment
+    xai_api_key = os.getenv('XAI_API_KEY')
+    if not xai_api_key:
+        raise ValueError("XAI_API_KEY environment variable is not set")
+    return xai_api_key
+
+
+def get_base_url():
+    # XAI_BASE_URL lets tests point the client at a local stub server
+    load_dotenv()
+    return os.getenv('XAI_BASE_URL', BASE_URL)
+
+
+def make_http_client(max_connections=MAX_IN_FLIGHT, http2=True):
+    """An httpx.AsyncClient with keep-alive pooling, on HTTP/2 when h2 is available."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                          keepalive_expiry=60.0)
+    timeout = httpx.Timeout(600.0, connect=10.0)
+    try:
+        return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+    except ImportError:
+        # httpx raises ImportError for http2=True without the h2 package
+        return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+class GrokClient:
+    """Shared async client with a cap on concurrent requests.
+
+    The underlying AsyncOpenAI client is created on the first cache miss,
+    so a run served entirely from `cache` never needs an API key. Requests
+    go through `scheduler` (a RequestScheduler), which paces them against
+    the rate limits and retries transient failures; share one scheduler
+    between clients that draw on the same quota. Every call, including
+    cache hits and failures, is recorded to `telemetry` (a TelemetryLog;
+    default: telemetry.default_log(), pass False to disable).
+    """
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, cache=None, model=MODEL,
+                 max_tokens=MAX_TOKENS, temperature=TEMPERATURE, http2=True, scheduler=None,
+                 telemetry=None, max_continuations=MAX_CONTINUATIONS):
+        self.max_in_flight = max_in_flight
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self.telemetry = default_log() if telemetry is None else telemetry or None
+        self.max_continuations = max_continuations
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.http2 = http2
+        self._client = None
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @property
+    def client(self):
+        if self._client is None:
+            # openai and httpx are only imported once a request has to be made
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(
+                api_key=get_api_key(),
+                base_url=get_base_url(),
+                http_client=make_http_client(self.max_in_flight, self.http2),
+                # Retries are the scheduler's job, so it can honour rate-limit headers
+                max_retries=0,
+            )
+        return self._client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def complete(self, prompt, max_tokens=None, temperature=None):
+        """Run one completion, returning (content, stats) like grok4call.complete().
+
+        A reply cut off at max_tokens is continued with up to
+        `max_continuations` follow-up requests (see continuation.py); stats
+        then sum over all of them. Truncated replies are not cached.
+        """
+        max_tokens = self.max_tokens if max_tokens is None else max_tokens
+        temperature = self.temperature if temperature is None else temperature
+        key = cache_key(self.model, prompt, temperature, max_tokens)
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                stats = {'cache_hit': True, 'total_latency': 0.0, 'prompt_tokens': 0,
+                         'completion_tokens': 0, 'finish_reason': None, 'continuations': 0}
+                self._record(stats, max_tokens, temperature)
+                return content, stats
+
+        def request(messages, continuation):
+            return self._request(messages, max_tokens, temperature, continuation)
+
+        content, stats = await complete_with_continuations(prompt, request, self.max_continuations)
+        if self.cache is not None and stats['finish_reason'] != 'length':
+            self.cache.put(key, content, model=self.model)
+        return content, stats
+
+    async def _request(self, messages, max_tokens, temperature, continuation=0):
+        def request():
+            return self.client.chat.completions.with_raw_response.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+
+        # Rough prompt size (4 characters per token) plus the completion budget
+        estimated_tokens = sum(len(message["content"]) for message in messages) // 4 + max_tokens
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                completion = await self.scheduler.run(request, estimated_tokens)
+            except Exception as exc:
+                self._record({'cache_hit': False, 'total_latency': time.perf_counter() - start},
+                             max_tokens, temperature, continuation=continuation,
+                             error=f"{type(exc).__name__}: {exc}")
+                raise
+            latency = time.perf_counter() - start
+        usage = completion.usage
+        stats = {
+            'cache_hit': False,
+            'total_latency': latency,
+            'prompt_tokens': usage.prompt_tokens if usage else 0,
+            'completion_tokens': usage.completion_tokens if usage else 0,
+            'finish_reason': completion.choices[0].finish_reason,
+        }
+        self._record(stats, max_tokens, temperature, id=completion.id, continuation=continuation)
+        return completion.choices[0].message.content or '', stats
+
+    def _record(self, stats, max_tokens, temperature, **extra):
+        if self.telemetry is not None:
+            fields = {'model': self.model, 'stream': False, 'max_tokens': max_tokens, 'temperature': temperature,
+                      'time_to_first_token': None, 'error': None}
+            self.telemetry.record(**{**fields, **stats, **extra})
+
+    async def complete_many(self, prompts, return_exceptions=False):
+        """Complete every prompt concurrently; results are in prompt order."""
+        return await asyncio.gather(*(self.complete(prompt) for prompt in prompts),
+                                    return_exceptions=return_exceptions)
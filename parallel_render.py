@@ -0,0 +1,321 @@
+"""Render the scene_N_* methods of a multi-scene Manim class in parallel.
+
+A class like QuantumFieldTheoryAnimation calls its scene methods one after
+another from construct(), so a normal `manim` run keeps a single core busy.
+This script renders every scene method as its own job in a process pool and
+concatenates the clips into the final video:
+
+    python parallel_render.py quantum_field_theory_clean.py QuantumFieldTheoryAnimation -j 4
+
+Scenes are not fully independent. A scene that does not start with
+self.clear() keeps the mobjects left on screen by the previous one (scene 2
+reuses scene 1's axes), and camera state such as the zoom from scene 2
+survives every later clear(). Before rendering, a fast skip-animations pass
+records a camera checkpoint at each scene boundary; each job restores the
+checkpoint and replays, without writing frames, the earlier scenes whose
+mobjects it inherits.
+"""
+
+import argparse
+import ast
+import importlib.util
+import inspect
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+SCENE_METHOD_RE = re.compile(r"^scene_(\d+)_\w+$")
+
+QUALITIES = ["low_quality", "medium_quality", "high_quality", "production_quality", "fourk_quality"]
+
+
+@dataclass
+class SceneJob:
+    """One independently renderable scene method."""
+    script: str
+    class_name: str
+    method: str
+    replay: list = field(default_factory=list)
+    camera: dict = field(default_factory=dict)
+    quality: str = "high_quality"
+    media_dir: str = "media"
+    tex_dir: str = None
+
+
+def load_scene_class(script_path, class_name):
+    """Import a scene script by path and return the requested scene class.
+
+    The module is cached under the script's basename, and loaded again if that
+    name now points at another file or the file changed since it was loaded.
+    A long-lived process, such as a render_farm worker, then never renders a
+    stale class.
+    """
+    module_name = os.path.splitext(os.path.basename(script_path))[0]
+    path = os.path.abspath(script_path)
+    mtime = os.stat(path).st_mtime_ns
+    module = sys.modules.get(module_name)
+    if module is not None and (os.path.abspath(getattr(module, '__file__', '') or '') != path
+                               or getattr(module, '_scene_mtime', None) != mtime):
+        module = None
+    if module is None:
+        # Scene scripts import helpers such as fast_mobjects from their own directory
+        script_dir = os.path.dirname(os.path.abspath(script_path))
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        module._scene_mtime = mtime
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return getattr(module, class_name)
+
+
+def _method_body(method):
+    tree = ast.parse(textwrap.dedent(inspect.getsource(method)))
+    return tree.body[0].body
+
+
+def _self_call_name(node):
+    # Return "name" for a bare `self.name(...)` statement, else None
+    if not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)):
+        return None
+    func = node.value.func
+    if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self":
+        return func.attr
+    return None
+
+
+def scene_methods(scene_cls):
+    """Return the scene_N_* method names in the order construct() calls them."""
+    try:
+        calls = [_self_call_name(node) for node in _method_body(scene_cls.construct)]
+        methods = [name for name in calls if name and SCENE_METHOD_RE.match(name)]
+    except (OSError, TypeError):
+        methods = []
+    if not methods:
+        methods = sorted((name for name in dir(scene_cls) if SCENE_METHOD_RE.match(name)),
+                         key=lambda name: int(SCENE_METHOD_RE.match(name).group(1)))
+    return methods
+
+
+def starts_with_clear(method):
+    """True if the scene method's first statement is self.clear()."""
+    body = _method_body(method)
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+        body = body[1:]  # skip a docstring
+    return bool(body) and _self_call_name(body[0]) == "clear"
+
+
+def scene_dependencies(scene_cls, methods):
+    """Map each scene method to the earlier methods that must be replayed first.
+
+    A scene inherits the mobjects of the one before it unless it begins with
+    self.clear(), so the replay chain walks back to the nearest scene that
+    starts from an empty frame.
+    """
+    deps = {}
+    for i, name in enumerate(methods):
+        j = i
+        while j > 0 and not starts_with_clear(getattr(scene_cls, methods[j])):
+            j -= 1
+        deps[name] = methods[j:i]
+    return deps
+
+
+def capture_camera_state(scene):
+    """Snapshot the camera of a ThreeDScene as plain, picklable values."""
+    camera = scene.camera
+    if not hasattr(camera, "get_phi"):
+        return {}
+    return {
+        "phi": float(camera.get_phi()),
+        "theta": float(camera.get_theta()),
+        "gamma": float(camera.get_gamma()),
+        "zoom": float(camera.get_zoom()),
+        "focal_distance": float(camera.get_focal_distance()),
+        "frame_center": [float(x) for x in camera.frame_center],
+    }
+
+
+def restore_camera_state(scene, state):
+    if not state:
+        return
+    import numpy as np
+    state = dict(state)
+    state["frame_center"] = np.array(state["frame_center"])
+    scene.set_camera_orientation(**state)
+
+
+def _render_config(quality, media_dir=None, tex_dir=None, **extra):
+    options = dict(extra, quality=quality)
+    if media_dir:
+        options["media_dir"] = media_dir
+    if tex_dir:
+        options["tex_dir"] = tex_dir
+    return options
+
+
+def compute_checkpoints(scene_cls, methods, tex_dir=None):
+    """Run every scene with animations skipped and record the camera state
+    at the start of each scene method."""
+    from manim import tempconfig
+
+    class Checkpoint(scene_cls):
+        def construct(self):
+            self.next_section("checkpoint", skip_animations=True)
+            for name in methods:
+                self.checkpoints[name] = capture_camera_state(self)
+                getattr(self, name)()
+
+    Checkpoint.checkpoints = {}
+    with tempconfig(_render_config("low_quality", tex_dir=tex_dir, dry_run=True)):
+        Checkpoint().render()
+    return Checkpoint.checkpoints
+
+
+def plan_jobs(script, class_name, quality="high_quality", media_dir="media", tex_dir=None):
+    """Split a multi-scene class into one SceneJob per scene method."""
+    scene_cls = load_scene_class(script, class_name)
+    methods = scene_methods(scene_cls)
+    deps = scene_dependencies(scene_cls, methods)
+    checkpoints = compute_checkpoints(scene_cls, methods, tex_dir)
+    jobs = []
+    for name in methods:
+        replay = deps[name]
+        camera = checkpoints[replay[0] if replay else name]
+        jobs.append(SceneJob(script, class_name, name, replay, camera, quality, media_dir, tex_dir))
+    return jobs
+
+
+def partial_scene_class(job):
+    """Scene class that replays job.replay without writing frames, then plays job.method."""
+    from scene_rng import seed_globals
+
+    scene_cls = load_scene_class(job.script, job.class_name)
+
+    class Partial(scene_cls):
+        def construct(self):
+            self.next_section("replay", skip_animations=True)
+            restore_camera_state(self, job.camera)
+            for name in job.replay:
+                seed_globals(name)
+                getattr(self, name)()
+            self.next_section(job.method)
+            # Unseeded np.random draws come out the same in every process
+            seed_globals(job.method)
+            getattr(self, job.method)()
+
+    # A distinct class name keeps each job's partial_movie_files separate
+    Partial.__name__ = f"{job.class_name}_{job.method}"
+    return Partial
+
+
+def render_scene_job(job):
+    """Render a single scene method and return the path of its movie file."""
+    from manim import tempconfig
+
+    # Load the script before tempconfig: a module-level `config.quality = ...`
+    # in it would otherwise override job.quality for the whole render
+    scene_cls = partial_scene_class(job)
+    with tempconfig(_render_config(job.quality, job.media_dir, job.tex_dir)):
+        scene = scene_cls()
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def concat_clips(clips, output):
+    """Losslessly join rendered clips with ffmpeg's concat demuxer."""
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as listing:
+        for clip in clips:
+            listing.write(f"file '{os.path.abspath(clip)}'\n")
+    try:
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                        "-i", listing.name, "-c", "copy", output], check=True)
+    finally:
+        os.remove(listing.name)
+    return output
+
+
+def default_output(script, class_name, media_dir="media"):
+    module_name = os.path.splitext(os.path.basename(script))[0]
+    return os.path.join(media_dir, "videos", module_name, f"{class_name}_parallel.mp4")
+
+
+def render_jobs(jobs, workers=None):
+    """Render jobs in a spawn-based process pool, preserving job order."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(render_scene_job, jobs))
+
+
+def precompile_tex(script, workers=None, tex_dir=None):
+    """Build the script's literal LaTeX across the pool; returns the Tex cache dir."""
+    from tex_pool import TEX_CACHE_DIR, precompile_script
+
+    tex_dir = tex_dir or TEX_CACHE_DIR
+    for call, error in precompile_script(script, tex_dir, workers):
+        if error:
+            print(f"Warning: line {call.lineno}: {call.cls}{call.args!r} failed to compile: {error}")
+    return tex_dir
+
+
+def render_cached(jobs, workers=None, cache=None):
+    """Render jobs whose clips aren't in `cache` (a SceneCache); returns every clip in job order."""
+    from render_cache import scene_key
+
+    keys = [scene_key(job) for job in jobs]
+    clips = [cache.get(key) if cache else None for key in keys]
+    todo = [i for i, clip in enumerate(clips) if clip is None]
+    if cache:
+        print(f"Scene cache: {len(jobs) - len(todo)} of {len(jobs)} scenes reused")
+    if todo:
+        for i, clip in zip(todo, render_jobs([jobs[i] for i in todo], workers)):
+            clips[i] = cache.put(keys[i], clip) if cache else clip
+    return clips
+
+
+def render_parallel(script, class_name, quality="high_quality", workers=None,
+                    output=None, media_dir="media", use_cache=True, tex_dir=None):
+    """Render every scene method in parallel and join the clips.
+
+    The script's LaTeX is first precompiled across the pool into tex_dir
+    (default: the shared tex_pool cache). With use_cache, clips of scenes
+    whose source and entry state are unchanged are taken from
+    <media_dir>/scene_cache instead of rendered.
+    """
+    from render_cache import SceneCache
+
+    tex_dir = precompile_tex(script, workers, tex_dir)
+    jobs = plan_jobs(script, class_name, quality, media_dir, tex_dir)
+    cache = SceneCache(os.path.join(media_dir, "scene_cache")) if use_cache else None
+    clips = render_cached(jobs, workers, cache)
+    return concat_clips(clips, output or default_output(script, class_name, media_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render scene_N_* methods in parallel.")
+    parser.add_argument("script", help="Manim script, e.g. quantum_field_theory_clean.py")
+    parser.add_argument("scene", help="Scene class, e.g. QuantumFieldTheoryAnimation")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="high_quality")
+    parser.add_argument("-o", "--output", help="final video path")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--tex-dir", help="shared Tex cache directory (default: the tex_pool cache)")
+    parser.add_argument("--no-scene-cache", action="store_true",
+                        help="re-render every scene instead of reusing cached clips")
+    args = parser.parse_args()
+
+    output = render_parallel(args.script, args.scene, args.quality, args.jobs,
+                             args.output, args.media_dir, not args.no_scene_cache, args.tex_dir)
+    print(f"Rendered {args.scene} to '{output}'")
+
+
+if __name__ == "__main__":
+    main()
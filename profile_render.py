@@ -0,0 +1,199 @@
+"""Find which play()/wait()/move_camera() calls dominate a scene's render time.
+
+Renders the scene class (or only some scene methods) with every play, wait
+and move_camera call timed. CPU time and wall time are attributed to the
+line in the script that made the call and to the chain of script functions
+above it (construct -> scene_1_intro_title -> ...). Calls made while
+animations are skipped, such as the replay before a -m scene, are not
+counted. Two outputs are written:
+
+- a collapsed-stack profile (one "frame;frame;leaf microseconds" line per
+  call site), readable by flamegraph.pl, speedscope or inferno
+- a table of the top-N most expensive calls
+
+    python profile_render.py quantum_field_theory_clean.py QuantumFieldTheoryAnimation -m scene_1_intro_title
+    flamegraph.pl media/profile/QuantumFieldTheoryAnimation.folded > scene1.svg
+
+CPU time is this process only. LaTeX and ffmpeg subprocesses show up in
+wall time but not in CPU time.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from parallel_render import QUALITIES, _render_config, load_scene_class, plan_jobs, restore_camera_state
+
+TOP_N = 20
+
+
+@dataclass
+class CallSample:
+    stack: tuple      # ("construct:12", "scene_1_intro_title:48"), outermost first
+    method: str       # innermost scene method (or function) in the script
+    lineno: int
+    label: str        # e.g. "play(Create, FadeIn)"
+    cpu: float
+    wall: float
+
+
+def _animation_names(animations):
+    names = []
+    for animation in animations:
+        name = type(animation).__name__
+        names.append('animate' if name == '_AnimationBuilder' else name)
+    if len(names) > 3:
+        names = names[:3] + [f"+{len(names) - 3}"]
+    return ', '.join(names)
+
+
+def _script_stack(script):
+    # Frames of the profiled script on the current stack, outermost first
+    frames = []
+    frame = sys._getframe(2)
+    while frame is not None:
+        if os.path.abspath(frame.f_code.co_filename) == script:
+            frames.append((frame.f_code.co_name, frame.f_lineno))
+        frame = frame.f_back
+    return frames[::-1]
+
+
+def profiled_scene(scene_cls, script, jobs=None, samples=None):
+    """Subclass of scene_cls that records a CallSample per play/wait/move_camera.
+
+    With `jobs` (parallel_render SceneJobs), only their methods are rendered,
+    each set up the way render_scene_job would: camera checkpoint restored,
+    earlier scenes replayed and the global RNGs seeded.
+    """
+    from scene_rng import seed_globals
+
+    script = os.path.abspath(script)
+    samples = [] if samples is None else samples
+
+    class Profiled(scene_cls):
+        _profile_depth = 0
+
+        def _profiled(self, label, call):
+            # move_camera calls play; only the outermost call is recorded
+            # renderer.skip_animations is only refreshed inside play(), so it still
+            # reads True on the first call after the replay section
+            sections = self.renderer.file_writer.sections
+            if self._profile_depth or (sections and sections[-1].skip_animations):
+                return call()
+            stack = _script_stack(script)
+            self._profile_depth += 1
+            cpu, wall = time.process_time(), time.perf_counter()
+            try:
+                return call()
+            finally:
+                self._profile_depth -= 1
+                if stack:
+                    name, lineno = stack[-1]
+                    samples.append(CallSample(tuple(f"{fn}:{line}" for fn, line in stack), name, lineno, label,
+                                              time.process_time() - cpu, time.perf_counter() - wall))
+
+        def play(self, *args, **kwargs):
+            return self._profiled(f"play({_animation_names(args)})",
+                                  lambda: super(Profiled, self).play(*args, **kwargs))
+
+        def wait(self, *args, **kwargs):
+            duration = args[0] if args else kwargs.get('duration', 1)
+            return self._profiled(f"wait({duration})", lambda: super(Profiled, self).wait(*args, **kwargs))
+
+        if hasattr(scene_cls, 'move_camera'):
+            def move_camera(self, *args, **kwargs):
+                return self._profiled("move_camera", lambda: super(Profiled, self).move_camera(*args, **kwargs))
+
+        if jobs:
+            def construct(self):
+                for job in jobs:
+                    self.next_section(f"replay {job.method}", skip_animations=True)
+                    restore_camera_state(self, job.camera)
+                    for earlier in job.replay:
+                        seed_globals(earlier)
+                        getattr(self, earlier)()
+                    self.next_section(job.method)
+                    seed_globals(job.method)
+                    getattr(self, job.method)()
+                    if len(jobs) > 1:
+                        self.clear()
+
+    Profiled.__name__ = f"{scene_cls.__name__}_profile"
+    Profiled.samples = samples
+    return Profiled
+
+
+def profile_scene(script, class_name, methods=None, quality="low_quality", media_dir="media"):
+    """Render the scene with profiling hooks; returns the list of CallSamples."""
+    from manim import tempconfig
+
+    jobs = None
+    if methods:
+        # Same replay chains and camera checkpoints as a parallel render
+        planned = {job.method: job for job in plan_jobs(script, class_name, quality, media_dir)}
+        missing = [name for name in methods if name not in planned]
+        if missing:
+            raise KeyError(f"{class_name} has no scene method {', '.join(missing)}")
+        jobs = [planned[name] for name in methods]
+    scene_cls = load_scene_class(script, class_name)
+    profiled = profiled_scene(scene_cls, script, jobs)
+    with tempconfig(_render_config(quality, media_dir)):
+        profiled().render()
+    return profiled.samples
+
+
+def collapse(samples, class_name):
+    """Collapsed-stack lines, weighted by CPU microseconds."""
+    totals = defaultdict(float)
+    for sample in samples:
+        totals[(class_name,) + sample.stack + (sample.label,)] += sample.cpu
+    return [f"{';'.join(stack)} {round(cpu * 1e6)}" for stack, cpu in sorted(totals.items())]
+
+
+def top_calls(samples, n=TOP_N):
+    """Aggregate samples per call site, most CPU first:
+    [(method, lineno, label, calls, cpu, wall)]."""
+    sites = {}
+    for sample in samples:
+        key = (sample.method, sample.lineno, sample.label)
+        calls, cpu, wall = sites.get(key, (0, 0.0, 0.0))
+        sites[key] = (calls + 1, cpu + sample.cpu, wall + sample.wall)
+    rows = [key + value for key, value in sites.items()]
+    return sorted(rows, key=lambda row: row[4], reverse=True)[:n]
+
+
+def format_table(rows, total_cpu):
+    lines = [f"{'cpu s':>8} {'%':>6} {'wall s':>8} {'calls':>5}  location"]
+    for method, lineno, label, calls, cpu, wall in rows:
+        share = cpu / total_cpu * 100 if total_cpu else 0.0
+        lines.append(f"{cpu:8.2f} {share:5.1f}% {wall:8.2f} {calls:5d}  {method}:{lineno} {label}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the play/wait/move_camera calls of a scene.")
+    parser.add_argument('script', help="Manim script, e.g. quantum_field_theory_clean.py")
+    parser.add_argument('scene', help="Scene class, e.g. QuantumFieldTheoryAnimation")
+    parser.add_argument('-m', '--method', action='append', help="only profile this scene method (repeatable)")
+    parser.add_argument('-q', '--quality', default="low_quality", choices=QUALITIES)
+    parser.add_argument('-n', '--top', type=int, default=TOP_N, help="rows in the table of expensive calls")
+    parser.add_argument('-o', '--output', help="collapsed-stack file (default: media/profile/<Scene>.folded)")
+    parser.add_argument('--media-dir', default="media")
+    args = parser.parse_args()
+
+    samples = profile_scene(args.script, args.scene, args.method, args.quality, args.media_dir)
+    output = args.output or os.path.join(args.media_dir, "profile", f"{args.scene}.folded")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(collapse(samples, args.scene)) + '\n')
+
+    total_cpu = sum(sample.cpu for sample in samples)
+    print(format_table(top_calls(samples, args.top), total_cpu))
+    print(f"{len(samples)} calls, {total_cpu:.2f}s CPU. Collapsed stacks written to '{output}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Review scenes as cheap proxies, then render only approved scenes at full quality.
+
+The scene script sets config.quality = "high_quality" globally, so every
+iteration pays for 1080p60 frames. This splits the work in three steps:
+
+    python proxy_render.py preview quantum_field_theory_clean.py QuantumFieldTheoryAnimation
+    python proxy_render.py approve quantum_field_theory_clean.py QuantumFieldTheoryAnimation scene_1_intro_title ...
+    python proxy_render.py promote quantum_field_theory_clean.py QuantumFieldTheoryAnimation
+
+preview renders every scene at low quality (480p15 by default) and joins
+them into a proxy video. It also writes a review file,
+<media>/proxy/<Scene>.review.json, that records each scene's identity
+(render_cache.scene_identity: its source and entry state, independent of
+quality). approve marks scenes in that file. promote renders the approved
+scenes at full quality through the shared scene cache. Once every scene is
+approved, it assembles the final video from the full-quality clips.
+
+An approval only counts while the scene's identity still matches. Editing
+a scene after approving it puts it back up for review.
+"""
+
+import argparse
+import json
+import os
+
+from parallel_render import (QUALITIES, concat_clips, default_output, plan_jobs, precompile_tex,
+                             render_cached)
+from render_cache import SceneCache, scene_identity
+
+PROXY_QUALITY = "low_quality"
+FINAL_QUALITY = "high_quality"
+
+
+def review_path(class_name, media_dir="media"):
+    return os.path.join(media_dir, "proxy", f"{class_name}.review.json")
+
+
+def load_review(class_name, media_dir="media"):
+    try:
+        with open(review_path(class_name, media_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'scenes': {}}
+
+
+def save_review(review, class_name, media_dir="media"):
+    path = review_path(class_name, media_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(review, f, indent=2)
+
+
+def preview(script, class_name, workers=None, media_dir="media", quality=PROXY_QUALITY):
+    """Render every scene as a proxy and record it for review."""
+    tex_dir = precompile_tex(script, workers)
+    jobs = plan_jobs(script, class_name, quality, media_dir, tex_dir)
+    clips = render_cached(jobs, workers, SceneCache(os.path.join(media_dir, "scene_cache")))
+
+    review = load_review(class_name, media_dir)
+    scenes = {}
+    for job, clip in zip(jobs, clips):
+        identity = scene_identity(job)
+        previous = review['scenes'].get(job.method, {})
+        scenes[job.method] = {
+            'identity': identity,
+            'proxy': clip,
+            'approved': previous.get('approved', False) and previous.get('identity') == identity,
+        }
+    review['scenes'] = scenes
+    save_review(review, class_name, media_dir)
+
+    output = os.path.join(media_dir, "proxy", f"{class_name}_proxy.mp4")
+    return concat_clips(clips, output), review
+
+
+def approve(class_name, methods, media_dir="media", approved=True):
+    review = load_review(class_name, media_dir)
+    unknown = [name for name in methods if name not in review['scenes']]
+    if unknown:
+        raise KeyError(f"Not in the last preview: {', '.join(unknown)}")
+    for name in methods or review['scenes']:
+        review['scenes'][name]['approved'] = approved
+    save_review(review, class_name, media_dir)
+    return review
+
+
+def promote(script, class_name, workers=None, media_dir="media", quality=FINAL_QUALITY, output=None):
+    """Render approved scenes at full quality; assemble the final video once all are approved.
+
+    Returns (final video path or None, scenes still awaiting approval).
+    """
+    tex_dir = precompile_tex(script, workers)
+    jobs = plan_jobs(script, class_name, quality, media_dir, tex_dir)
+    review = load_review(class_name, media_dir)['scenes']
+    approved = [job for job in jobs
+                if review.get(job.method, {}).get('approved')
+                and review[job.method]['identity'] == scene_identity(job)]
+    pending = [job.method for job in jobs if job not in approved]
+
+    cache = SceneCache(os.path.join(media_dir, "scene_cache"))
+    clips = render_cached(approved, workers, cache)
+    if pending:
+        return None, pending
+    return concat_clips(clips, output or default_output(script, class_name, media_dir)), []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proxy review and full-quality promotion of scene renders.")
+    parser.add_argument('command', choices=['preview', 'approve', 'unapprove', 'promote'])
+    parser.add_argument('script', help="Manim script, e.g. quantum_field_theory_clean.py")
+    parser.add_argument('scene', help="Scene class, e.g. QuantumFieldTheoryAnimation")
+    parser.add_argument('methods', nargs='*', help="scene methods to (un)approve (default: all)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('-q', '--quality', choices=QUALITIES,
+                        help=f"render quality (default: {PROXY_QUALITY} for preview, {FINAL_QUALITY} for promote)")
+    parser.add_argument('-o', '--output', help="final video path for promote")
+    parser.add_argument('--media-dir', default="media")
+    args = parser.parse_args()
+
+    if args.command == 'preview':
+        output, review = preview(args.script, args.scene, args.jobs, args.media_dir,
+                                 args.quality or PROXY_QUALITY)
+        print(f"Proxy video: '{output}'")
+        for name, scene in review['scenes'].items():
+            print(f"  {'approved' if scene['approved'] else 'pending '}  {name}  {scene['proxy']}")
+        print(f"Review file: '{review_path(args.scene, args.media_dir)}'")
+    elif args.command in ('approve', 'unapprove'):
+        review = approve(args.scene, args.methods, args.media_dir, args.command == 'approve')
+        approved = sum(scene['approved'] for scene in review['scenes'].values())
+        print(f"{approved} of {len(review['scenes'])} scenes approved")
+    else:
+        output, pending = promote(args.script, args.scene, args.jobs, args.media_dir,
+                                  args.quality or FINAL_QUALITY, args.output)
+        if pending:
+            print("Rendered approved scenes at full quality; awaiting approval:", ", ".join(pending))
+        else:
+            print(f"Rendered {args.scene} to '{output}'")
+
+
+if __name__ == '__main__':
+    main()
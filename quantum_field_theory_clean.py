@@ -1,6 +1,9 @@
 from manim import *
 import numpy as np
 
+from fast_mobjects import EMWave, StarField
+from scene_rng import scene_rng
+
 # Configuration for better rendering
 config.media_width = "100%"
 config.quality = "high_quality"
@@ -29,9 +32,8 @@ class QuantumFieldTheoryAnimation(ThreeDScene):
         self.scene_7_final_collage()
 
     def scene_1_intro_title(self):
-        # Star field backdrop (simplified as dots)
-        stars = VGroup(*[Dot(radius=0.05, color=WHITE).move_to(np.random.uniform(-7, 7, size=3))
-                         for _ in range(200)])
+        # Star field backdrop (point cloud with per-star size and brightness)
+        stars = StarField(n_stars=200, rng=scene_rng("scene_1_intro_title"))
         stars.set_opacity(0)
         self.add(stars)
         self.play(stars.animate.set_opacity(1), run_time=3)
@@ -79,18 +81,14 @@ class QuantumFieldTheoryAnimation(ThreeDScene):
         self.move_camera(zoom=0.5, run_time=2)
         self.wait(1)
 
-        # Electric and Magnetic field waves (simplified as sine waves)
-        e_field = ParametricFunction(lambda t: np.array([t, np.sin(t * 2), 0]),
-                                    t_range=(-PI, PI), color=RED)
-        b_field = ParametricFunction(lambda t: np.array([t, 0, np.sin(t * 2)]),
-                                    t_range=(-PI, PI), color=BLUE)
-        e_field.move_to(ORIGIN)
-        b_field.move_to(ORIGIN)
-        self.play(Create(e_field), Create(b_field), run_time=2)
+        # Electric and magnetic fields of a propagating plane wave, with field vectors
+        wave = EMWave(length=TAU, amplitude=1, wavenumber=2, n_arrows=16)
+        self.play(Create(wave), run_time=2)
+        wave.start_propagating()
 
         # Labels and arrows
-        e_label = MathTex(r"\vec{E}", color=RED).next_to(e_field, UP)
-        b_label = MathTex(r"\vec{B}", color=BLUE).next_to(b_field, RIGHT)
+        e_label = MathTex(r"\vec{E}", color=RED).next_to(wave.e_curve, UP)
+        b_label = MathTex(r"\vec{B}", color=BLUE).next_to(wave.b_curve, RIGHT)
         prop_arrow = Arrow(start=ORIGIN, end=RIGHT * 2, color=WHITE)
         self.play(Write(e_label), Write(b_label), GrowArrow(prop_arrow), run_time=1.5)
         self.wait(2)
@@ -184,8 +182,7 @@ class QuantumFieldTheoryAnimation(ThreeDScene):
         self.play(FadeIn(axes), FadeIn(lagrangian), FadeIn(feynman), FadeIn(summary), run_time=3)
 
         # Zoom out and return to star field
-        stars = VGroup(*[Dot(radius=0.05, color=WHITE).move_to(np.random.uniform(-7, 7, size=3))
-                         for _ in range(200)])
+        stars = StarField(n_stars=200, rng=scene_rng("scene_7_final_collage"))
         self.add(stars)
         self.move_camera(zoom=2, run_time=3)
         self.play(FadeOut(axes, lagrangian, feynman, summary), run_time=3)
@@ -0,0 +1,170 @@
+"""Retry, backoff and rate-limit scheduling for generation requests.
+
+RequestScheduler.run() sits between GrokClient and the API:
+
+- two token buckets pace requests/min and tokens/min, so a batch runs at
+  the highest sustainable rate instead of tripping 429s
+- x-ratelimit-remaining-* / x-ratelimit-reset-* response headers
+  resynchronise the buckets with the server's view of the quota
+- 429, 408, 5xx and connection errors are retried with full-jitter
+  exponential backoff, honouring Retry-After when the server sends one
+
+Point XAI_BASE_URL at a local stub server to exercise all of this without
+touching the real endpoint.
+"""
+
+import asyncio
+import random
+import re
+import time
+
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 100_000
+MAX_RETRIES = 6
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def parse_duration(value):
+    """Parse '20', '1.5s', '250ms' or '6m0s' into seconds; None if unparseable."""
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+def retry_after(headers):
+    """Seconds the server asked us to wait, from Retry-After(-ms) headers."""
+    if headers is None:
+        return None
+    if headers.get('retry-after-ms'):
+        try:
+            return float(headers['retry-after-ms']) / 1000
+        except ValueError:
+            pass
+    return parse_duration(headers.get('retry-after'))
+
+
+class TokenBucket:
+    """Continuous-refill token bucket holding up to one minute of quota."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        # `updated` lies in the future while the server says the quota is exhausted
+        if now > self.updated:
+            self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+            self.updated = now
+
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                wait = (amount - self.available) / self.rate + max(0.0, self.updated - time.monotonic())
+                await asyncio.sleep(wait)
+
+    def refund(self, amount):
+        """Return (or, if negative, charge) quota after the real cost is known."""
+        self.available = min(self.capacity, self.available + amount)
+
+    def sync(self, remaining, reset):
+        """Clamp to the server-reported remaining quota; if none is left,
+        hold refilling until the reported reset time."""
+        if remaining is None:
+            return
+        self._refill()
+        self.available = min(self.available, remaining)
+        if remaining <= 0 and reset:
+            self.updated = max(self.updated, time.monotonic() + reset)
+
+
+class RequestScheduler:
+    """Paces, retries and backs off calls to the chat completions endpoint."""
+
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                 max_retries=MAX_RETRIES, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt):
+        # Full jitter keeps concurrent retries from stampeding in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def observe(self, headers):
+        if headers is None:
+            return
+
+        def number(name):
+            try:
+                return float(headers[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        self.requests.sync(number('x-ratelimit-remaining-requests'),
+                           parse_duration(headers.get('x-ratelimit-reset-requests')))
+        self.tokens.sync(number('x-ratelimit-remaining-tokens'),
+                         parse_duration(headers.get('x-ratelimit-reset-tokens')))
+
+    def should_retry(self, exc):
+        import openai
+
+        if isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError)):
+            return True
+        return isinstance(exc, openai.APIStatusError) and exc.status_code in RETRY_STATUSES
+
+    async def run(self, request, estimated_tokens):
+        """Call `request()` (returning a with_raw_response result) under the
+        rate limits, retrying transient failures. Returns the parsed completion."""
+        # Imported here so that a run served from the cache never loads openai
+        import openai
+
+        for attempt in range(self.max_retries + 1):
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimated_tokens)
+            try:
+                raw = await request()
+            except openai.APIError as exc:
+                headers = exc.response.headers if isinstance(exc, openai.APIStatusError) else None
+                self.observe(headers)
+                if attempt == self.max_retries or not self.should_retry(exc):
+                    raise
+                delay = retry_after(headers)
+                await asyncio.sleep(min(self.max_delay, delay) if delay is not None else self.backoff(attempt))
+                continue
+
+            self.observe(raw.headers)
+            completion = raw.parse()
+            # A stream's usage only arrives with its last chunk; the caller settles it with refund()
+            usage = getattr(completion, 'usage', None)
+            if usage is not None:
+                self.tokens.refund(estimated_tokens - usage.total_tokens)
+            return completion
+
+    def refund(self, estimated_tokens, usage):
+        """Settle a streamed request's token estimate once its usage is known."""
+        if usage is not None:
+            self.tokens.refund(estimated_tokens - usage.total_tokens)
@@ -0,0 +1,271 @@
+"""Benchmark how long each scene of a multi-scene class takes to render.
+
+Every scene_N_* method is rendered on its own, one after another, each in a
+fresh Python process, so peak RSS and one-off setup are per scene. As in
+parallel_render, a scene first replays the scenes it inherits mobjects from
+without writing frames. For each scene the report records:
+
+- wall time, the replay part of it, frames written and frames/sec
+- peak RSS of the render process and of its LaTeX/ffmpeg children
+- time spent compiling TeX, parsing SVG (Tex, MathTex and Text), running
+  mobject updates, rasterizing frames, and encoding/muxing video
+
+    python render_benchmark.py quantum_field_theory_clean.py QuantumFieldTheoryAnimation -q low_quality -o bench.json
+    python render_benchmark.py quantum_field_theory_clean.py QuantumFieldTheoryAnimation --baseline bench.json
+
+By default each scene gets an empty Tex cache, so TeX cost is measured
+rather than hidden by earlier runs; --warm-tex precompiles into the shared
+tex_pool cache and renders from it instead. The JSON report can be diffed
+between runs or against a --baseline, e.g. before and after a Manim upgrade
+or a regenerated script.
+"""
+
+import argparse
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from parallel_render import QUALITIES, SceneJob, plan_jobs, precompile_tex, render_scene_job
+from tex_pool import TEX_CACHE_DIR
+
+TIMEOUT = 1800  # seconds per scene
+
+# (metric, module, class or None, attribute); missing hooks are skipped so
+# the harness keeps working across Manim versions
+HOOKS = [
+    ('tex', 'manim.utils.tex_file_writing', None, 'tex_to_svg_file'),
+    ('svg', 'manim.mobject.svg.svg_mobject', 'SVGMobject', 'generate_mobject'),
+    ('updates', 'manim.scene.scene', 'Scene', 'update_mobjects'),
+    ('updates', 'manim.animation.animation', 'Animation', 'update_mobjects'),
+    ('rasterize', 'manim.camera.camera', 'Camera', 'capture_mobjects'),
+    ('encode', 'manim.scene.scene_file_writer', 'SceneFileWriter', 'write_frame'),
+    ('encode', 'manim.scene.scene_file_writer', 'SceneFileWriter', 'close_partial_movie_stream'),
+    ('encode', 'manim.scene.scene_file_writer', 'SceneFileWriter', 'combine_to_movie'),
+    ('encode', 'manim.scene.scene_file_writer', 'SceneFileWriter', 'combine_to_section_videos'),
+]
+
+
+class Timers:
+    """Accumulated seconds per metric; nested calls of one metric count once."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.depth = {}
+        self.frames = 0
+        self.sections = []   # perf_counter() at each next_section call
+
+    def wrap(self, metric, func):
+        self.seconds.setdefault(metric, 0.0)
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            depth = self.depth.get(metric, 0)
+            self.depth[metric] = depth + 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.depth[metric] = depth
+                if depth == 0:
+                    self.seconds[metric] += time.perf_counter() - start
+        return timed
+
+
+def install_hooks(timers):
+    import importlib
+
+    for metric, module_name, class_name, attribute in HOOKS:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        owner = getattr(module, class_name, None) if class_name else module
+        func = getattr(owner, attribute, None) if owner is not None else None
+        if func is None:
+            continue
+        setattr(owner, attribute, timers.wrap(metric, func))
+        if class_name is None:
+            # `from ... import tex_to_svg_file` binds the original in the Tex mobjects
+            tex_module = sys.modules.get('manim.mobject.text.tex_mobject')
+            if tex_module is not None and getattr(tex_module, attribute, None) is func:
+                setattr(tex_module, attribute, getattr(owner, attribute))
+
+    from manim.scene.scene import Scene
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    write_frame = SceneFileWriter.write_frame
+
+    @functools.wraps(write_frame)
+    def counted(self, *args, **kwargs):
+        timers.frames += kwargs.get('num_frames', args[1] if len(args) > 1 else 1)
+        return write_frame(self, *args, **kwargs)
+    SceneFileWriter.write_frame = counted
+
+    # The second section marks the end of the replay
+    next_section = Scene.next_section
+
+    @functools.wraps(next_section)
+    def marked(self, *args, **kwargs):
+        timers.sections.append(time.perf_counter())
+        return next_section(self, *args, **kwargs)
+    Scene.next_section = marked
+
+
+def _peak_rss_mb(who):
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def benchmark_job(job):
+    """Render one SceneJob in this process and return its measurements."""
+    import manim  # noqa: F401  (load every module the hooks patch)
+
+    timers = Timers()
+    install_hooks(timers)
+    start = time.perf_counter()
+    clip = render_scene_job(job)
+    wall = time.perf_counter() - start
+    replay = timers.sections[1] - start if len(timers.sections) > 1 else 0.0
+    render = wall - replay
+    return {
+        'method': job.method,
+        'replay': job.replay,
+        'wall_s': round(wall, 3),
+        'replay_s': round(replay, 3),
+        'frames': timers.frames,
+        'fps': round(timers.frames / render, 2) if render > 0 else None,
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF),
+        'children_peak_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        'time_s': {metric: round(seconds, 3) for metric, seconds in sorted(timers.seconds.items())},
+        'clip': clip,
+    }
+
+
+def run_isolated(job, timeout=TIMEOUT):
+    """benchmark_job in a fresh interpreter, so nothing is shared between scenes."""
+    fd, job_path = tempfile.mkstemp(suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(dataclasses.asdict(job), f)
+    try:
+        process = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', job_path],
+                                 timeout=timeout, capture_output=True)
+        if process.returncode != 0:
+            tail = process.stderr.decode('utf-8', errors='replace').strip().splitlines()[-1:]
+            return {'method': job.method, 'error': tail[0] if tail else f"exit code {process.returncode}"}
+        return json.loads(process.stdout.decode('utf-8').strip().splitlines()[-1])
+    except subprocess.TimeoutExpired:
+        return {'method': job.method, 'error': f"did not finish within {timeout}s"}
+    finally:
+        os.remove(job_path)
+
+
+def environment(script):
+    from importlib import metadata
+
+    with open(script, 'rb') as f:
+        script_hash = hashlib.sha256(f.read()).hexdigest()
+    try:
+        manim_version = metadata.version('manim')
+    except metadata.PackageNotFoundError:
+        manim_version = None
+    return {
+        'script': script,
+        'script_sha256': script_hash,
+        'manim': manim_version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def run_benchmark(script, class_name, quality="low_quality", methods=None, warm_tex=False, timeout=TIMEOUT):
+    """Benchmark every scene method (or only `methods`) and return the report."""
+    with tempfile.TemporaryDirectory(prefix='render-bench-') as scratch:
+        tex_dir = precompile_tex(script, tex_dir=TEX_CACHE_DIR) if warm_tex else os.path.join(scratch, 'tex')
+        jobs = plan_jobs(script, class_name, quality, os.path.join(scratch, 'media'), tex_dir)
+        if methods:
+            jobs = [job for job in jobs if job.method in methods]
+
+        scenes = []
+        for job in jobs:
+            if not warm_tex:
+                # Each scene starts from an empty Tex cache
+                job = dataclasses.replace(job, tex_dir=os.path.join(scratch, 'tex', job.method))
+            result = run_isolated(job, timeout)
+            result.pop('clip', None)
+            scenes.append(result)
+            print(format_scene(result), file=sys.stderr)
+
+    return {'environment': environment(script), 'class': class_name, 'quality': quality,
+            'warm_tex': warm_tex, 'scenes': scenes}
+
+
+def format_scene(scene, baseline=None):
+    if 'error' in scene:
+        return f"{scene['method']:<40} FAILED: {scene['error']}"
+    times = ' '.join(f"{metric}={seconds:.2f}s" for metric, seconds in scene['time_s'].items())
+    line = (f"{scene['method']:<40} {scene['wall_s']:8.2f}s {scene['frames']:6d} frames "
+            f"{scene['fps'] or 0:7.2f} fps {scene['peak_rss_mb']:8.1f} MB  {times}")
+    if baseline and 'wall_s' in baseline:
+        change = (scene['wall_s'] - baseline['wall_s']) / baseline['wall_s'] * 100 if baseline['wall_s'] else 0.0
+        line += f"  ({change:+.1f}% wall vs baseline)"
+    return line
+
+
+def print_report(report, baseline=None):
+    previous = {scene['method']: scene for scene in (baseline or {}).get('scenes', [])}
+    for scene in report['scenes']:
+        print(format_scene(scene, previous.get(scene['method'])))
+    total = sum(scene.get('wall_s', 0) for scene in report['scenes'])
+    line = f"Total: {total:.2f}s over {len(report['scenes'])} scenes at {report['quality']}"
+    if previous:
+        old = sum(scene.get('wall_s', 0) for scene in previous.values())
+        if old:
+            line += f" ({(total - old) / old * 100:+.1f}% vs baseline)"
+    print(line)
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--worker':
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            job = SceneJob(**json.load(f))
+        print(json.dumps(benchmark_job(job)))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the render of each scene method.")
+    parser.add_argument('script', help="Manim script, e.g. quantum_field_theory_clean.py")
+    parser.add_argument('scene', help="Scene class, e.g. QuantumFieldTheoryAnimation")
+    parser.add_argument('-q', '--quality', default="low_quality", choices=QUALITIES)
+    parser.add_argument('-m', '--method', action='append', help="only benchmark this scene method (repeatable)")
+    parser.add_argument('-o', '--output', help="write the JSON report here")
+    parser.add_argument('--baseline', help="earlier JSON report to compare against")
+    parser.add_argument('--warm-tex', action='store_true', help="use the shared Tex cache instead of an empty one")
+    parser.add_argument('--timeout', type=int, default=TIMEOUT, help="seconds before a scene is abandoned")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.script, args.scene, args.quality, args.method, args.warm_tex, args.timeout)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to '{args.output}'")
+    if any('error' in scene for scene in report['scenes']):
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Scene-level render cache for parallel_render.
+
+Manim's partial_movie_files are hashed per play() call from the live
+mobject state, so editing scene 6 changes nothing about scenes 1-5 yet still
+forces them to be re-evaluated. Here a whole scene clip is keyed instead on
+what determines it:
+
+- the AST of the scene method and of the methods replayed before it
+- the camera checkpoint the job starts from
+- the rest of the script (imports, config, helpers) and the local modules it imports
+- the render seed (scene_rng), the Manim version, and the render quality (scene_identity() leaves it
+  out, so a low-quality proxy and its final render share an identity)
+
+Because the key is built from the AST, edits to comments or formatting
+still hit the cache. An unchanged scene is reused as a finished clip and only
+edited scenes are rendered.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import metadata
+
+from parallel_render import SCENE_METHOD_RE
+from scene_rng import RENDER_SEED
+
+
+def _class_node(tree, class_name):
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            return node
+    raise KeyError(f"class {class_name} not found")
+
+
+def _local_imports(tree, script_dir):
+    # Sibling modules such as fast_mobjects.py shape the output too
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    paths = (os.path.join(script_dir, name + '.py') for name in sorted(names))
+    return [path for path in paths if os.path.exists(path)]
+
+
+def _manim_version():
+    try:
+        return metadata.version('manim')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def scene_identity(job):
+    """Content hash of everything that determines a scene's clip except the
+    render quality, so a proxy and its full-quality render share an identity."""
+    with open(job.script, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    scene_class = _class_node(tree, job.class_name)
+    methods = {node.name: ast.dump(node) for node in scene_class.body
+               if isinstance(node, ast.FunctionDef) and SCENE_METHOD_RE.match(node.name)}
+    scene_class.body = [node for node in scene_class.body
+                        if not (isinstance(node, ast.FunctionDef) and SCENE_METHOD_RE.match(node.name))]
+
+    digest = hashlib.sha256()
+    for path in _local_imports(tree, os.path.dirname(os.path.abspath(job.script))):
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(json.dumps({
+        'context': ast.dump(tree),
+        'method': methods[job.method],
+        'replay': [methods[name] for name in job.replay],
+        'camera': {name: (round(value, 6) if isinstance(value, float) else [round(x, 6) for x in value])
+                   for name, value in sorted(job.camera.items())},
+        'manim': _manim_version(),
+        'seed': RENDER_SEED,
+    }, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def scene_key(job):
+    """Content hash identifying the clip a SceneJob will produce."""
+    return hashlib.sha256(f"{scene_identity(job)}:{job.quality}".encode('utf-8')).hexdigest()
+
+
+class SceneCache:
+    """Finished scene clips stored as <directory>/<key>.mp4."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.mp4')
+
+    def get(self, key):
+        path = self.path(key)
+        return path if os.path.exists(path) else None
+
+    def put(self, key, clip):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(clip, tmp_path)
+        os.replace(tmp_path, self.path(key))
+        return self.path(key)
@@ -0,0 +1,326 @@
+"""Render farm: a coordinator queues scene jobs, workers render them.
+
+Everything lives in a farm directory, which can be local or on a share
+that all the machines mount:
+
+    <farm>/queue/pending/   job files waiting for a worker
+    <farm>/queue/claimed/   jobs a worker has taken (claimed by os.rename)
+    <farm>/queue/done/      finished jobs
+    <farm>/queue/failed/    jobs that raised, with the error
+    <farm>/store/           finished clips, content-addressed by render_cache.scene_key
+    <farm>/tex/             the shared Tex cache
+    <farm>/runs/            one manifest per submitted video
+    <farm>/work/<worker>/   each worker's Manim media directory
+
+A job is a script, a scene class, a range of consecutive scene methods and a
+quality; each method in it is rendered as a parallel_render SceneJob. Clips
+already in the store are never rendered again, whichever run or worker
+produced them. Once every clip of a run is in the store, the coordinator
+joins them into the final video.
+
+Everything on localhost, with 4 worker processes:
+
+    python render_farm.py run quantum_field_theory_clean.py QuantumFieldTheoryAnimation -n 4
+
+Or piece by piece, e.g. with workers on other machines:
+
+    python render_farm.py submit quantum_field_theory_clean.py QuantumFieldTheoryAnimation --farm /shared/farm
+    python render_farm.py worker --farm /shared/farm          # on each render machine
+    python render_farm.py assemble --farm /shared/farm QuantumFieldTheoryAnimation-<id>
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+
+from parallel_render import (QUALITIES, SceneJob, concat_clips, default_output, plan_jobs, precompile_tex,
+                             render_scene_job)
+from render_cache import SceneCache, scene_key
+
+FARM_DIR = "farm"
+QUEUE_STATES = ('pending', 'claimed', 'done', 'failed')
+POLL_INTERVAL = 2.0        # seconds between queue scans
+STALE_AFTER = 3600         # seconds without a heartbeat before a claim goes back to pending
+HEARTBEAT_INTERVAL = 60    # seconds between touches of a claim being rendered
+
+
+def queue_dir(farm, state):
+    return os.path.join(farm, "queue", state)
+
+
+def store(farm):
+    return SceneCache(os.path.join(farm, "store"))
+
+
+def _write_json(path, data):
+    # Write then rename, so a reader never sees half a file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def chunk(jobs, size):
+    return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+
+def submit(script, class_name, farm=FARM_DIR, quality="high_quality", methods_per_job=1, output=None):
+    """Queue the scenes of `class_name` that aren't in the store; returns (run id, scenes queued)."""
+    script = os.path.abspath(script)
+    tex_dir = precompile_tex(script, tex_dir=os.path.abspath(os.path.join(farm, "tex")))
+    jobs = plan_jobs(script, class_name, quality, media_dir=None, tex_dir=tex_dir)
+    keys = [scene_key(job) for job in jobs]
+    clips = store(farm)
+
+    run_id = f"{class_name}-{uuid.uuid4().hex[:8]}"
+    todo = [(job, key) for job, key in zip(jobs, keys) if clips.get(key) is None]
+    for n, group in enumerate(chunk(todo, methods_per_job)):
+        job_id = f"{time.time_ns()}-{run_id}-{n:03d}"
+        _write_json(os.path.join(queue_dir(farm, 'pending'), job_id + '.json'), {
+            'id': job_id,
+            'run': run_id,
+            'scenes': [dataclasses.asdict(job) for job, _ in group],
+            'keys': [key for _, key in group],
+        })
+    _write_json(os.path.join(farm, "runs", run_id + '.json'), {
+        'script': script,
+        'class_name': class_name,
+        'quality': quality,
+        'methods': [job.method for job in jobs],
+        'keys': keys,
+        'output': os.path.abspath(output or default_output(script, class_name)),
+        'submitted': time.time(),
+    })
+    return run_id, len(todo)
+
+
+def claim(farm, worker_id):
+    """Atomically take the oldest pending job; returns its claimed path or None."""
+    claimed_dir = queue_dir(farm, 'claimed')
+    os.makedirs(claimed_dir, exist_ok=True)
+    for path in sorted(glob.glob(os.path.join(queue_dir(farm, 'pending'), '*.json'))):
+        target = os.path.join(claimed_dir, f"{worker_id}@{os.path.basename(path)}")
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue   # another worker got there first
+        os.utime(target)   # the claim's mtime is when work started
+        return target
+    return None
+
+
+def _job_name(claimed_path):
+    # Claimed files are named <worker>@<job id>.json
+    return os.path.basename(claimed_path).rsplit('@', 1)[1]
+
+
+def _finish(farm, path, state, **extra):
+    """Move a claim to `state`; False if the claim was lost, e.g. requeued as stale meanwhile."""
+    try:
+        job = dict(_read_json(path), **extra)
+    except FileNotFoundError:
+        return False
+    _write_json(os.path.join(queue_dir(farm, state), _job_name(path)), job)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+    return True
+
+
+@contextlib.contextmanager
+def heartbeat(path, interval=HEARTBEAT_INTERVAL):
+    """Touch a claim every `interval` seconds while the block runs, so requeue_stale() leaves it alone."""
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return   # the claim was requeued or finished elsewhere
+
+    os.utime(path)
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_claimed(path, farm, worker_id):
+    """Render every scene of a claimed job into the store."""
+    job = _read_json(path)
+    clips = store(farm)
+    media_dir = os.path.join(farm, "work", worker_id)
+    try:
+        with heartbeat(path):
+            for scene, key in zip(job['scenes'], job['keys']):
+                if clips.get(key) is not None:
+                    continue
+                scene_job = dataclasses.replace(SceneJob(**scene), media_dir=media_dir)
+                if scene_key(scene_job) != key:
+                    raise RuntimeError(f"{scene_job.script} changed since {scene_job.method} was submitted")
+                clips.put(key, render_scene_job(scene_job))
+    except Exception as exc:
+        _finish(farm, path, 'failed', worker=worker_id, error=f"{type(exc).__name__}: {exc}",
+                traceback=traceback.format_exc())
+        return False
+    if not _finish(farm, path, 'done', worker=worker_id):
+        print(f"[{worker_id}] lost the claim on {_job_name(path)}; its clips are stored anyway", flush=True)
+    return True
+
+
+def requeue_stale(farm, stale_after=STALE_AFTER):
+    """Put back claims untouched for stale_after seconds (their worker presumably died)."""
+    requeued = []
+    for path in glob.glob(os.path.join(queue_dir(farm, 'claimed'), '*.json')):
+        try:
+            if time.time() - os.path.getmtime(path) < stale_after:
+                continue
+            target = os.path.join(queue_dir(farm, 'pending'), _job_name(path))
+            os.rename(path, target)
+            requeued.append(target)
+        except FileNotFoundError:
+            continue   # finished meanwhile
+    return requeued
+
+
+def worker(farm=FARM_DIR, worker_id=None, exit_when_idle=False, poll_interval=POLL_INTERVAL):
+    """Claim and render jobs until stopped (or until the queue is empty, with exit_when_idle)."""
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    rendered = 0
+    while True:
+        path = claim(farm, worker_id)
+        if path is None:
+            if exit_when_idle:
+                return rendered
+            time.sleep(poll_interval)
+            continue
+        print(f"[{worker_id}] {os.path.basename(path)}", flush=True)
+        rendered += run_claimed(path, farm, worker_id)
+
+
+def status(farm=FARM_DIR):
+    counts = {state: len(glob.glob(os.path.join(queue_dir(farm, state), '*.json'))) for state in QUEUE_STATES}
+    counts['stored clips'] = len(glob.glob(os.path.join(farm, "store", "*.mp4")))
+    return counts
+
+
+def failures(farm, run_id):
+    return [_read_json(path) for path in glob.glob(os.path.join(queue_dir(farm, 'failed'), f"*-{run_id}-*.json"))]
+
+
+def wait_for_run(farm, run_id, poll_interval=POLL_INTERVAL, stale_after=STALE_AFTER, timeout=None):
+    """Block until every clip of the run is stored.
+
+    Raises if one of its jobs failed, or if clips are still missing after
+    `timeout` seconds (0 checks once).
+    """
+    run = _read_json(os.path.join(farm, "runs", run_id + '.json'))
+    clips = store(farm)
+    deadline = None if timeout is None else time.time() + timeout
+    while True:
+        missing = [method for method, key in zip(run['methods'], run['keys']) if clips.get(key) is None]
+        if not missing:
+            return run
+        failed = failures(farm, run_id)
+        if failed:
+            raise RuntimeError("; ".join(f"{job['id']}: {job['error']}" for job in failed))
+        if deadline is not None and time.time() >= deadline:
+            raise RuntimeError(f"{run_id}: not rendered: {', '.join(missing)}")
+        requeue_stale(farm, stale_after)
+        time.sleep(poll_interval)
+
+
+def assemble(farm, run_id, output=None):
+    """Join a finished run's clips from the store into its video."""
+    run = _read_json(os.path.join(farm, "runs", run_id + '.json'))
+    clips = store(farm)
+    missing = [method for method, key in zip(run['methods'], run['keys']) if clips.get(key) is None]
+    if missing:
+        raise RuntimeError(f"not rendered yet: {', '.join(missing)}")
+    return concat_clips([clips.get(key) for key in run['keys']], output or run['output'])
+
+
+def run_local(script, class_name, workers=None, farm=FARM_DIR, quality="high_quality",
+              methods_per_job=1, output=None):
+    """Submit, render with `workers` local worker processes, and assemble."""
+    run_id, queued = submit(script, class_name, farm, quality, methods_per_job, output)
+    processes = [subprocess.Popen([sys.executable, os.path.abspath(__file__), 'worker', '--farm', farm,
+                                   '--id', f"local-{n}", '--exit-when-idle'])
+                 for n in range(min(workers or os.cpu_count(), queued))]
+    try:
+        for process in processes:
+            process.wait()
+        # Every worker has exited, so a clip that isn't stored by now never will be
+        wait_for_run(farm, run_id, timeout=0)
+    finally:
+        for process in processes:
+            process.kill()
+    return assemble(farm, run_id, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distribute scene renders over worker processes.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def scene_args(command):
+        command.add_argument('script', help="Manim script, e.g. quantum_field_theory_clean.py")
+        command.add_argument('scene', help="Scene class, e.g. QuantumFieldTheoryAnimation")
+        command.add_argument('-q', '--quality', default="high_quality", choices=QUALITIES)
+        command.add_argument('-k', '--methods-per-job', type=int, default=1,
+                             help="consecutive scene methods rendered by one job")
+        command.add_argument('-o', '--output', help="final video path")
+
+    run = commands.add_parser('run', help="submit, render with local workers and assemble")
+    scene_args(run)
+    run.add_argument('-n', '--workers', type=int, default=os.cpu_count(), help="local worker processes")
+    scene_args(commands.add_parser('submit', help="queue a scene class's jobs"))
+    work = commands.add_parser('worker', help="render queued jobs")
+    work.add_argument('--id', help="worker name (default: host-pid)")
+    work.add_argument('--exit-when-idle', action='store_true', help="stop once the queue is empty")
+    build = commands.add_parser('assemble', help="wait for a run's clips and join them")
+    build.add_argument('run_id')
+    build.add_argument('-o', '--output', help="final video path")
+    commands.add_parser('status', help="count jobs in each queue state")
+    for command in commands.choices.values():
+        command.add_argument('--farm', default=FARM_DIR, help="farm directory (queue, store, runs)")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        output = run_local(args.script, args.scene, args.workers, args.farm, args.quality,
+                           args.methods_per_job, args.output)
+        print(f"Rendered {args.scene} to '{output}'")
+    elif args.command == 'submit':
+        run_id, queued = submit(args.script, args.scene, args.farm, args.quality, args.methods_per_job, args.output)
+        print(f"Run {run_id}: {queued} scene(s) queued")
+    elif args.command == 'worker':
+        worker(args.farm, args.id, args.exit_when_idle)
+    elif args.command == 'assemble':
+        wait_for_run(args.farm, args.run_id)
+        print(f"Rendered {args.run_id} to '{assemble(args.farm, args.run_id, args.output)}'")
+    else:
+        for state, count in status(args.farm).items():
+            print(f"{state:<13} {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Repair a generated scene script by feeding dry-run errors back to the model.
+
+Instead of hand-editing a script that fails validation (which is how
+quantum_field_theory_clean.py came about), this loop:
+
+1. dry-runs the script with validate_script and finds the failing scene method
+2. sends just that method, the error and the traceback tail back to Grok
+3. splices the corrected method into the script
+4. re-validates only that scene, then the scenes after it
+
+until the script passes or --max-iterations repairs have been spent:
+
+    python repair.py manim_quantum_field_theory.py --max-iterations 3
+"""
+
+import argparse
+import ast
+import asyncio
+from dataclasses import dataclass, field
+
+from grok_client import GrokClient
+from parallel_render import SCENE_METHOD_RE
+from scene_manifest import read_methods, splice_method
+from scene_prompts import extract_code, extract_method
+from validate_script import find_scene_class, format_result, validate
+
+MAX_ITERATIONS = 3
+TRACEBACK_LINES = 30
+
+
+@dataclass
+class RepairReport:
+    ok: bool
+    repairs: list = field(default_factory=list)   # [(method, error)]
+    result: object = None                          # the last ValidationResult
+
+
+def scene_order(source, class_name):
+    """scene_N_* methods in the order the class's construct() calls them."""
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name == 'construct':
+                    calls = [sub.func.attr for sub in ast.walk(item)
+                             if isinstance(sub, ast.Call) and isinstance(sub.func, ast.Attribute)]
+                    return [name for name in calls if SCENE_METHOD_RE.match(name)]
+    return []
+
+
+def build_repair_prompt(method_source, result):
+    trace = "\n".join((result.traceback or "").strip().splitlines()[-TRACEBACK_LINES:])
+    return f"""The following method of a Manim Community v.19 ThreeDScene fails when the scene is run.
+
+Error (line {result.lineno} of the script): {result.error}
+
+Traceback (most recent call last, trimmed):
+{trace}
+
+Method:
+
+```python
+{method_source.rstrip()}
+```
+
+Please fix the error while keeping the method's name, intent, timing and visual content. Use only names available from `from manim import *` and `import numpy as np`. Reply with a single Python code block containing just the corrected method."""
+
+
+async def repair_script(script, class_name=None, max_iterations=MAX_ITERATIONS, grok=None):
+    """Validate and repair `script` in place; returns a RepairReport."""
+    with open(script, 'r', encoding='utf-8') as f:
+        source = f.read()
+    class_name = class_name or find_scene_class(source)
+    order = scene_order(source, class_name) if class_name else []
+    report = RepairReport(False)
+    owns_client = grok is None
+    grok = grok or GrokClient(max_in_flight=1)
+
+    try:
+        pending, repaired = None, None
+        while True:
+            result = await asyncio.to_thread(validate, script, class_name, pending)
+            report.result = result
+            if result.ok:
+                if repaired is None:
+                    report.ok = True
+                    return report
+                # The repaired scene passes; carry on with the scenes after it
+                later = order[order.index(repaired) + 1:]
+                if not later:
+                    report.ok = True
+                    return report
+                pending, repaired = later, None
+                continue
+
+            if result.method not in order or len(report.repairs) >= max_iterations:
+                # Errors outside a scene method (imports, config) aren't patched here
+                return report
+
+            with open(script, 'r', encoding='utf-8') as f:
+                source = f.read()
+            method_source = read_methods(source, [result.method])[result.method]
+            reply, _ = await grok.complete(build_repair_prompt(method_source, result))
+            fixed = extract_method(extract_code(reply), result.method)
+            with open(script, 'w', encoding='utf-8') as f:
+                f.write(splice_method(source, result.method, fixed))
+
+            report.repairs.append((result.method, result.error))
+            pending, repaired = [result.method], result.method
+    finally:
+        if owns_client:
+            await grok.aclose()
+
+
+def print_report(script, report):
+    for method, error in report.repairs:
+        print(f"Repaired {method}: {error}")
+    print(format_result(script, report.result))
+    if not report.ok:
+        print(f"Gave up after {len(report.repairs)} repair(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repair a failing scene script with Grok.")
+    parser.add_argument('script', help="generated Manim script")
+    parser.add_argument('--scene', help="scene class (default: the first Scene subclass)")
+    parser.add_argument('--max-iterations', type=int, default=MAX_ITERATIONS, help="maximum repair requests")
+    args = parser.parse_args()
+
+    report = asyncio.run(repair_script(args.script, args.scene, args.max_iterations))
+    print_report(args.script, report)
+    if not report.ok:
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
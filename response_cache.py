@@ -0,0 +1,98 @@
+"""On-disk, content-addressed cache of Grok completions.
+
+Entries are keyed by a SHA-256 of (model, prompt, temperature, max_tokens),
+so a re-run with an unchanged universe.txt returns the stored script without
+an API call. With --by-scene each scene prompt is cached on its own, so
+editing one scene only regenerates that scene.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_DIR = '.grok_cache'
+MAX_BYTES = 100 * 1024 * 1024
+MAX_AGE = 30 * 24 * 3600  # seconds
+
+
+def cache_key(model, prompt, temperature, max_tokens):
+    payload = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Completions stored as <directory>/<key[:2]>/<key>.json.
+
+    A hit refreshes the entry's mtime, so eviction drops expired entries
+    first and then the least recently used ones until the cache fits in
+    max_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES, max_age=MAX_AGE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                _remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry['content']
+
+    def put(self, key, content, **metadata):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = dict(metadata, content=content, created=time.time())
+        # Write to a temp file and rename so concurrent readers never see half an entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def entries(self):
+        """Yield (path, size, mtime) for every stored entry."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def evict(self):
+        now = time.time()
+        kept = []
+        for path, size, mtime in self.entries():
+            if now - mtime > self.max_age:
+                _remove(path)
+            else:
+                kept.append((mtime, size, path))
+        total = sum(size for _, size, _ in kept)
+        for _, size, path in sorted(kept):
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+
+def _remove(path):
+    # Another writer sharing the cache may have evicted it already
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,115 @@
+"""Track which scene descriptions produced which scene methods.
+
+A scene-sharded generation writes '<script>.manifest.json' next to the
+script, recording for every scene_N_* method the hash of the description
+text it came from and the generated source. Regeneration compares the
+current universe.txt against the manifest and only re-prompts scenes whose
+description changed; their new methods are spliced into the existing
+script in place, leaving every other method (and any hand edits to it)
+untouched.
+"""
+
+import ast
+import hashlib
+import json
+import textwrap
+
+from scene_prompts import assemble_script, find_method, method_source, method_span
+
+
+def manifest_path(script_path):
+    return script_path + '.manifest.json'
+
+
+def description_hash(scene):
+    # Whitespace-only edits shouldn't trigger a regeneration
+    text = ' '.join(f"{scene.title}\n{scene.body}".split())
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def load_manifest(script_path):
+    try:
+        with open(manifest_path(script_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'scenes': {}}
+
+
+def save_manifest(script_path, scenes, methods, class_name="QuantumFieldTheoryAnimation"):
+    """Record description hashes and method sources for `scenes`.
+
+    `methods` maps method names to their source.
+    """
+    manifest = {
+        'class_name': class_name,
+        'scenes': {
+            scene.method_name: {
+                'number': scene.number,
+                'title': scene.title,
+                'description_hash': description_hash(scene),
+                'source': methods[scene.method_name],
+            }
+            for scene in scenes
+        },
+    }
+    with open(manifest_path(script_path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def changed_scenes(scenes, manifest, script_source=None):
+    """Scenes whose description differs from the one recorded in the manifest,
+    plus any whose method is missing from the script."""
+    recorded = manifest.get('scenes', {})
+    present = read_methods(script_source, [s.method_name for s in scenes]) if script_source else {}
+    return [scene for scene in scenes
+            if recorded.get(scene.method_name, {}).get('description_hash') != description_hash(scene)
+            or (script_source is not None and scene.method_name not in present)]
+
+
+def read_methods(script_source, method_names):
+    """Return {name: dedented source} for the methods present in a script."""
+    tree = ast.parse(script_source)
+    lines = script_source.splitlines()
+    methods = {}
+    for name in method_names:
+        node = find_method(tree, name)
+        if node is not None:
+            methods[name] = method_source(lines, node)
+    return methods
+
+
+def splice_method(script_source, method_name, method_source):
+    """Replace one method in a script with new source, keeping its indentation."""
+    node = find_method(ast.parse(script_source), method_name)
+    if node is None:
+        raise KeyError(f"{method_name} not found in script")
+    lines = script_source.splitlines(keepends=True)
+    start, end = method_span(node)
+    indent = lines[start - 1][:len(lines[start - 1]) - len(lines[start - 1].lstrip())]
+    replacement = textwrap.indent(method_source.rstrip("\n"), indent) + "\n"
+    return "".join(lines[:start - 1]) + replacement + "".join(lines[end:])
+
+
+def update_script(script_source, scenes, new_methods, manifest,
+                  class_name="QuantumFieldTheoryAnimation"):
+    """Merge regenerated methods into an existing script.
+
+    When the scenes match those in the manifest each new method is spliced
+    in place. If scenes were added or removed the class is reassembled from
+    the existing methods plus the new ones. Returns (script, {name: source}).
+    """
+    names = [scene.method_name for scene in scenes]
+    existing = read_methods(script_source, names)
+    methods = dict(existing, **new_methods)
+    missing = [name for name in names if name not in methods]
+    if missing:
+        raise KeyError(f"No source for {', '.join(missing)}")
+
+    if sorted(manifest.get('scenes', {})) == sorted(names) and len(existing) == len(names):
+        for name, source in new_methods.items():
+            script_source = splice_method(script_source, name, source)
+    else:
+        script_source = assemble_script([(scene, methods[scene.method_name]) for scene in scenes],
+                                        class_name)
+    return script_source, methods
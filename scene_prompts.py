@@ -0,0 +1,128 @@
+"""Split an animation description into scenes and stitch per-scene code back together.
+
+universe.txt is organised as "Scene 1: Introduction and Title" ...
+"Scene 7: Final Collage and Summary" headings. Generating one scene method
+per heading keeps every completion well under the token limit and lets the
+scenes be generated concurrently; assemble_script() then builds a single
+QuantumFieldTheoryAnimation-style class out of the returned methods.
+"""
+
+import ast
+import re
+import textwrap
+from dataclasses import dataclass
+
+SCENE_HEADING_RE = re.compile(r"^Scene\s+(\d+)\s*:\s*(.+?)\s*$", re.MULTILINE)
+CODE_BLOCK_RE = re.compile(r"```(?:python|py)?[ \t]*\n(.*?)```", re.DOTALL)
+SLUG_STOPWORDS = {"a", "an", "and", "the", "of", "to", "into", "for"}
+
+SCRIPT_HEADER = '''from manim import *
+import numpy as np
+
+# Configuration for better rendering
+config.media_width = "100%"
+config.quality = "high_quality"
+'''
+
+
+@dataclass
+class SceneDescription:
+    number: int
+    title: str
+    body: str
+
+    @property
+    def method_name(self):
+        words = re.sub(r"[^a-z0-9 ]", "", self.title.lower()).split()
+        words = [word for word in words if word not in SLUG_STOPWORDS][:2]
+        return f"scene_{self.number}_{'_'.join(words)}"
+
+
+def split_scenes(description):
+    """Split a description on its "Scene N: Title" headings."""
+    matches = list(SCENE_HEADING_RE.finditer(description))
+    scenes = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(description)
+        body = description[match.end():end].strip()
+        scenes.append(SceneDescription(int(match.group(1)), match.group(2), body))
+    return scenes
+
+
+def build_scene_prompt(scene, scenes, class_name="QuantumFieldTheoryAnimation"):
+    outline = "\n".join(f"{s.number}. {s.title} -> {s.method_name}" for s in scenes)
+    return f"""Please convert the following scene description into Manim Community v.19 Python code.
+
+The scene is one part of a multi-scene animation implemented as a single ThreeDScene subclass named {class_name}. Its construct() calls these methods in order:
+
+{outline}
+
+Write ONLY the method `def {scene.method_name}(self):` for scene {scene.number}. It must:
+
+1. Use names available from `from manim import *` and `import numpy as np` only
+2. Render all mathematical equations using LaTeX (MathTex)
+3. Include the 3D elements, colors, animations, camera movements and effects described
+4. Call self.clear() first if it does not build on the previous scene's mobjects
+
+Here's the scene description:
+
+Scene {scene.number}: {scene.title}
+
+{scene.body}
+
+Reply with a single Python code block containing just that method."""
+
+
+def extract_code(text):
+    """Return the Python code in a model reply, dropping Markdown fences and prose."""
+    blocks = CODE_BLOCK_RE.findall(text)
+    if blocks:
+        return max(blocks, key=len).strip("\n") + "\n"
+    return text.strip("\n") + "\n"
+
+
+def find_method(tree, method_name):
+    """The FunctionDef named `method_name` anywhere in a parsed module, or None."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == method_name:
+            return node
+    return None
+
+
+def method_span(node):
+    """1-based (first, last) line numbers of a method, decorators included."""
+    start = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+    return start, node.end_lineno
+
+
+def method_source(lines, node):
+    """A method's source, from the parsed module's `lines`, dedented to column 0."""
+    start, end = method_span(node)
+    return textwrap.dedent("\n".join(lines[start - 1:end])) + "\n"
+
+
+def extract_method(code, method_name):
+    """Pull one method's source out of generated code, dedented to column 0.
+
+    Models sometimes wrap the method in a whole class; if the code doesn't
+    parse or the method isn't found, the code is returned dedented as is.
+    """
+    code = textwrap.dedent(code)
+    try:
+        node = find_method(ast.parse(code), method_name)
+    except SyntaxError:
+        return code
+    return method_source(code.splitlines(), node) if node is not None else code
+
+
+def assemble_script(methods, class_name="QuantumFieldTheoryAnimation"):
+    """Build a complete scene script from (SceneDescription, method source) pairs."""
+    construct = ["    def construct(self):"]
+    for scene, _ in methods:
+        construct.append(f"        # Scene {scene.number}: {scene.title}")
+        construct.append(f"        self.{scene.method_name}()")
+        construct.append("")
+    parts = [SCRIPT_HEADER, f"class {class_name}(ThreeDScene):", "\n".join(construct).rstrip() + "\n"]
+    for _, source in methods:
+        parts.append(textwrap.indent(source.rstrip("\n"), "    ") + "\n")
+    return "\n".join(parts)
@@ -0,0 +1,45 @@
+"""Seeded randomness for reproducible, cacheable renders.
+
+Unseeded np.random calls give every render different star positions. That
+changes the hash of each play() and defeats Manim's partial-movie cache,
+and it makes chunks of one scene rendered in different processes disagree.
+Scenes draw from a generator keyed on the scene instead:
+
+    from scene_rng import scene_rng
+
+    stars = StarField(n_stars=200, rng=scene_rng("scene_1_intro_title"))
+
+The same key always yields the same draws, whatever ran before it in the
+process. Each key is mixed with a render-wide seed ($MANIM_RENDER_SEED,
+default 0); change the seed to get a different but still reproducible
+render. parallel_render also reseeds numpy's and random's global RNGs with
+seed_globals() before every scene method, which covers generated scripts
+that still call np.random directly.
+"""
+
+import hashlib
+import os
+import random
+
+import numpy as np
+
+RENDER_SEED = int(os.getenv('MANIM_RENDER_SEED', '0'))
+
+
+def scene_seed(key, seed=None):
+    """64-bit seed for `key` (e.g. a scene method name) under the render seed."""
+    seed = RENDER_SEED if seed is None else seed
+    digest = hashlib.sha256(f"{seed}:{key}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def scene_rng(key, seed=None):
+    """A numpy Generator of its own for `key`."""
+    return np.random.default_rng(scene_seed(key, seed))
+
+
+def seed_globals(key, seed=None):
+    """Reseed numpy's and random's global RNGs for `key`."""
+    value = scene_seed(key, seed)
+    random.seed(value)
+    np.random.seed(value % 2 ** 32)
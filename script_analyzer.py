@@ -0,0 +1,141 @@
+"""Fail fast on bad LaTeX or missing fonts in a generated scene script.
+
+A broken MathTex string or a font that isn't installed (such as the
+"CMU Serif" title font in scene_1_intro_title) otherwise only shows up
+minutes into a render, when that line finally runs. This walks the script's
+AST, lists every MathTex/Tex/Text literal together with its font and the
+scene method it belongs to, then checks them all up front:
+
+- fonts are looked up in the fonts Pango can see
+- LaTeX is compiled in parallel through tex_pool, which also warms the
+  shared Tex cache for the render that follows
+
+    python script_analyzer.py manim_quantum_field_theory.py -j 8
+
+Exits non-zero and prints file:line (method) for every problem found.
+"""
+
+import argparse
+import ast
+import json
+import os
+from dataclasses import asdict, dataclass
+
+from tex_pool import TEX_CACHE_DIR, TEX_CLASSES, collect_tex_calls, precompile
+
+TEXT_CLASSES = {'Text', 'MarkupText', 'Paragraph'}
+
+
+@dataclass
+class ScriptString:
+    kind: str         # class name, e.g. "MathTex" or "Text"
+    text: str         # None when built at runtime (f-string, variable)
+    font: str         # None when not given or not a literal
+    lineno: int
+    method: str
+
+
+@dataclass
+class Problem:
+    lineno: int
+    method: str
+    message: str
+
+
+class _StringCollector(ast.NodeVisitor):
+    def __init__(self):
+        self.method = None
+        self.strings = []
+
+    def visit_FunctionDef(self, node):
+        outer, self.method = self.method, node.name
+        self.generic_visit(node)
+        self.method = outer
+
+    def visit_Call(self, node):
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, 'attr', None)
+        if name in TEX_CLASSES or name in TEXT_CLASSES:
+            texts = [arg.value for arg in node.args if isinstance(arg, ast.Constant) and isinstance(arg.value, str)]
+            literal = bool(node.args) and len(texts) == len(node.args)
+            font = None
+            for keyword in node.keywords:
+                if keyword.arg == 'font' and isinstance(keyword.value, ast.Constant):
+                    font = keyword.value.value
+            self.strings.append(ScriptString(name, ' '.join(texts) if literal else None, font,
+                                             node.lineno, self.method))
+        self.generic_visit(node)
+
+
+def extract_strings(source):
+    """Every MathTex/Tex/Text construction in a script, in source order."""
+    collector = _StringCollector()
+    collector.visit(ast.parse(source))
+    return sorted(collector.strings, key=lambda item: item.lineno)
+
+
+def method_spans(source):
+    """[(start, end, name)] for every function in a script."""
+    return [(node.lineno, node.end_lineno, node.name) for node in ast.walk(ast.parse(source))
+            if isinstance(node, ast.FunctionDef)]
+
+
+def method_at(spans, lineno):
+    # Innermost function containing the line
+    matches = [(end - start, name) for start, end, name in spans if start <= lineno <= end]
+    return min(matches)[1] if matches else None
+
+
+def available_fonts():
+    import manimpango
+    return {font.lower() for font in manimpango.list_fonts()}
+
+
+def check_fonts(strings, fonts=None):
+    fonts = available_fonts() if fonts is None else fonts
+    return [Problem(item.lineno, item.method, f"{item.kind} uses font '{item.font}', which is not installed")
+            for item in strings if item.font and item.font.lower() not in fonts]
+
+
+def check_tex(source, tex_dir=TEX_CACHE_DIR, workers=None):
+    spans = method_spans(source)
+    return [Problem(call.lineno, method_at(spans, call.lineno), f"{call.cls} failed to compile: {error}")
+            for call, error in precompile(collect_tex_calls(source), tex_dir, workers) if error]
+
+
+def analyze(script, tex_dir=TEX_CACHE_DIR, workers=None):
+    """Return (strings, problems) for a scene script."""
+    with open(script, 'r', encoding='utf-8') as f:
+        source = f.read()
+    try:
+        strings = extract_strings(source)
+    except SyntaxError as exc:
+        return [], [Problem(exc.lineno or 0, None, f"SyntaxError: {exc.msg}")]
+    problems = check_fonts(strings) + check_tex(source, tex_dir, workers)
+    return strings, sorted(problems, key=lambda problem: problem.lineno)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a scene script's TeX and fonts before rendering.")
+    parser.add_argument('script', help="generated Manim script")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="LaTeX worker processes")
+    parser.add_argument('--tex-dir', default=TEX_CACHE_DIR, help="shared Tex cache directory")
+    parser.add_argument('--json', action='store_true', help="print the strings and problems as JSON")
+    args = parser.parse_args()
+
+    strings, problems = analyze(args.script, args.tex_dir, args.jobs)
+    if args.json:
+        print(json.dumps({'strings': [asdict(item) for item in strings],
+                          'problems': [asdict(problem) for problem in problems]}, indent=2))
+    else:
+        for problem in problems:
+            print(f"{args.script}:{problem.lineno} ({problem.method}): {problem.message}")
+        dynamic = sum(item.text is None for item in strings)
+        print(f"Checked {len(strings)} MathTex/Tex/Text calls ({dynamic} built at runtime), "
+              f"{len(problems)} problem(s)")
+    if problems:
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Measure how quickly the generator CLI starts.
+
+Each scenario runs in a fresh interpreter, --repeat times, and the median
+wall time is reported:
+
+- `grok4call.py --help`
+- `grok4call.py validate --help`, i.e. everything before a dry run starts
+- a generation served from a pre-seeded response cache, with no network
+
+Each scenario also runs once under `python -X importtime`. That run
+reports any heavy module it loaded (openai, httpx, Manim, numpy...), which
+should stay lazy. The slowest imports behind `import grok4call` are also
+listed.
+
+    python startup_benchmark.py --repeat 10 --budget 1.0
+
+Exits non-zero if a scenario's median exceeds --budget seconds.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPEAT = 5
+BUDGET = 1.0  # seconds
+TOP_N = 15
+HEAVY_MODULES = {'openai', 'httpx', 'h2', 'manim', 'manimpango', 'numpy', 'pandas', 'bs4', 'lxml', 'pydantic'}
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLI = os.path.join(HERE, 'grok4call.py')
+
+
+def seed_cache(directory):
+    """A description and a cache directory holding the reply to its prompt."""
+    from grok4call import build_prompt
+    from grok_client import MAX_TOKENS, MODEL, TEMPERATURE
+    from response_cache import ResponseCache, cache_key
+
+    description = os.path.join(directory, 'description.txt')
+    with open(description, 'w', encoding='utf-8') as f:
+        f.write("Scene 1: Title\nA title card.\n")
+    with open(description, 'r', encoding='utf-8') as f:
+        prompt = build_prompt(f.read())
+    cache_dir = os.path.join(directory, 'cache')
+    ResponseCache(cache_dir).put(cache_key(MODEL, prompt, TEMPERATURE, MAX_TOKENS),
+                                 "```python\nfrom manim import *\n```", model=MODEL)
+    return description, cache_dir
+
+
+def scenarios(directory):
+    description, cache_dir = seed_cache(directory)
+    return {
+        'help': [CLI, '--help'],
+        'validate --help': [CLI, 'validate', '--help'],
+        'generate (cache hit)': [CLI, 'generate', '--input', description, '--cache-dir', cache_dir,
+                                 '--output', os.path.join(directory, 'out.py')],
+    }
+
+
+def run_once(args, env):
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable] + args, env=env, cwd=HERE, capture_output=True)
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        tail = process.stderr.decode('utf-8', errors='replace').strip().splitlines()[-1:]
+        raise RuntimeError(tail[0] if tail else f"exit code {process.returncode}")
+    return elapsed
+
+
+def import_times(args, env):
+    """[(cumulative seconds, module)] from `python -X importtime`, slowest first."""
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + args, env=env, cwd=HERE,
+                             capture_output=True)
+    rows = []
+    for line in process.stderr.decode('utf-8', errors='replace').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)
+
+
+def heavy_imports(rows):
+    return sorted({name.split('.')[0] for _, name in rows} & HEAVY_MODULES)
+
+
+def run_benchmark(repeat=REPEAT, top=TOP_N):
+    # Keep the benchmark's own runs out of the telemetry log
+    env = dict(os.environ, GROK_TELEMETRY_LOG='')
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='startup-bench-') as directory:
+        for name, args in scenarios(directory).items():
+            try:
+                times = [run_once(args, env) for _ in range(repeat)]
+            except RuntimeError as exc:
+                results[name] = {'error': str(exc)}
+                continue
+            results[name] = {
+                'median_s': statistics.median(times),
+                'min_s': min(times),
+                'max_s': max(times),
+                'heavy_imports': heavy_imports(import_times(args, env)),
+            }
+    slowest = import_times(['-c', 'import grok4call'], env)[:top]
+    return {'python': sys.version.split()[0], 'repeat': repeat, 'scenarios': results,
+            'slowest_imports': [{'module': name, 'cumulative_s': seconds} for seconds, name in slowest]}
+
+
+def print_report(report, budget):
+    for name, result in report['scenarios'].items():
+        if 'error' in result:
+            print(f"{name:<24} FAILED: {result['error']}")
+            continue
+        flag = '  OVER BUDGET' if result['median_s'] > budget else ''
+        heavy = f"  loads {', '.join(result['heavy_imports'])}" if result['heavy_imports'] else ''
+        print(f"{name:<24} median {result['median_s'] * 1000:7.1f} ms "
+              f"(min {result['min_s'] * 1000:.1f}, max {result['max_s'] * 1000:.1f}){heavy}{flag}")
+    print("\nSlowest imports behind `import grok4call` (cumulative):")
+    for row in report['slowest_imports']:
+        print(f"  {row['cumulative_s'] * 1000:8.1f} ms  {row['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generator CLI startup and import time.")
+    parser.add_argument('-r', '--repeat', type=int, default=REPEAT, help="runs per scenario")
+    parser.add_argument('-b', '--budget', type=float, default=BUDGET, help="maximum median seconds per scenario")
+    parser.add_argument('-n', '--top', type=int, default=TOP_N, help="slowest imports to list")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.repeat, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.budget)
+    if any('error' in result or result['median_s'] > args.budget for result in report['scenarios'].values()):
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
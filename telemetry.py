@@ -0,0 +1,184 @@
+"""Per-request generation telemetry and a percentile summary over it.
+
+Every Grok call made through GrokClient or grok4call.generate_streaming
+appends one JSON line to the telemetry log (default 'grok_telemetry.jsonl',
+or $GROK_TELEMETRY_LOG; set it to an empty string to turn logging off):
+
+    {"time": 1760601600.2, "model": "grok-3", "stream": false, "cache_hit": false,
+     "prompt_tokens": 812, "completion_tokens": 3120, "time_to_first_token": null,
+     "total_latency": 41.7, "finish_reason": "stop", "error": null, ...}
+
+time_to_first_token is only known for streamed requests. Summarize a log,
+optionally just the part written since a given time:
+
+    python telemetry.py grok_telemetry.jsonl --since 2026-10-16T09:00
+    python telemetry.py --json --prompt-price 3 --completion-price 15
+
+The summary gives latency, time-to-first-token and per-request tokens/s
+percentiles. It also gives the sustained request and token rates over the
+logged span, which can be compared with the RPM/TPM limits in rate_limit.
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+TELEMETRY_LOG = 'grok_telemetry.jsonl'
+PERCENTILES = (50, 90, 99)
+
+
+class TelemetryLog:
+    """Append-only JSONL log of request records."""
+
+    def __init__(self, path=TELEMETRY_LOG):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, **fields):
+        entry = {'time': time.time(), **fields}
+        line = json.dumps(entry, default=str) + '\n'
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            # One write() per line in append mode, so concurrent writers don't interleave
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        return entry
+
+
+def default_log():
+    """The TelemetryLog named by $GROK_TELEMETRY_LOG, or None if it is set empty."""
+    load_dotenv()
+    path = os.getenv('GROK_TELEMETRY_LOG', TELEMETRY_LOG)
+    return TelemetryLog(path) if path else None
+
+
+def read_records(path=TELEMETRY_LOG, since=None):
+    """Records in the log, skipping lines that don't parse and any before `since` (epoch seconds)."""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue   # a line cut short by a crash
+            if since is None or record.get('time', 0) >= since:
+                records.append(record)
+    return records
+
+
+def percentile(values, q):
+    """q-th percentile with linear interpolation; None for no values."""
+    values = sorted(values)
+    if not values:
+        return None
+    rank = (len(values) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _distribution(values):
+    return {f"p{q}": percentile(values, q) for q in PERCENTILES} | {
+        'mean': sum(values) / len(values) if values else None,
+        'max': max(values) if values else None,
+    }
+
+
+def summarize(records, prompt_price=None, completion_price=None):
+    """Aggregate records into counts, token totals, percentiles and rates.
+
+    Prices are per million tokens; the cost estimate is left out without them.
+    """
+    api = [record for record in records if not record.get('cache_hit')]
+    ok = [record for record in api if not record.get('error')]
+    prompt_tokens = sum(record.get('prompt_tokens') or 0 for record in ok)
+    completion_tokens = sum(record.get('completion_tokens') or 0 for record in ok)
+    throughput = [record['completion_tokens'] / record['total_latency'] for record in ok
+                  if record.get('completion_tokens') and record.get('total_latency')]
+
+    times = [record['time'] for record in api if 'time' in record]
+    # The span runs from the first request's start to the last one's finish
+    starts = [record['time'] - (record.get('total_latency') or 0) for record in api if 'time' in record]
+    span = max(times) - min(starts) if times else 0.0
+    per_minute = 60 / span if span > 0 else None
+
+    summary = {
+        'requests': len(records),
+        'cache_hits': len(records) - len(api),
+        'api_requests': len(api),
+        'errors': len(api) - len(ok),
+        'finish_reasons': dict(Counter(record.get('finish_reason') for record in ok)),
+        'models': dict(Counter(record.get('model') for record in api)),
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'latency_s': _distribution([record['total_latency'] for record in ok
+                                    if record.get('total_latency') is not None]),
+        'time_to_first_token_s': _distribution([record['time_to_first_token'] for record in ok
+                                                if record.get('time_to_first_token') is not None]),
+        'tokens_per_second': _distribution(throughput),
+        'span_s': span,
+        'requests_per_minute': len(api) * per_minute if per_minute else None,
+        'tokens_per_minute': (prompt_tokens + completion_tokens) * per_minute if per_minute else None,
+    }
+    if prompt_price is not None or completion_price is not None:
+        summary['estimated_cost'] = (prompt_tokens * (prompt_price or 0)
+                                     + completion_tokens * (completion_price or 0)) / 1e6
+    return summary
+
+
+def _format_distribution(name, stats, unit):
+    if stats['mean'] is None:
+        return f"{name:<22} n/a"
+    cells = ' '.join(f"p{q} {stats[f'p{q}']:8.2f}{unit}" for q in PERCENTILES)
+    return f"{name:<22} {cells}   max {stats['max']:8.2f}{unit}"
+
+
+def format_summary(summary):
+    lines = [
+        f"{summary['requests']} requests: {summary['api_requests']} to the API "
+        f"({summary['errors']} failed), {summary['cache_hits']} cache hits",
+        f"Tokens: {summary['prompt_tokens']} prompt, {summary['completion_tokens']} completion",
+        "Finish reasons: " + (', '.join(f"{reason}={count}" for reason, count
+                                        in summary['finish_reasons'].items()) or "none"),
+        _format_distribution("Latency", summary['latency_s'], 's'),
+        _format_distribution("Time to first token", summary['time_to_first_token_s'], 's'),
+        _format_distribution("Tokens/s per request", summary['tokens_per_second'], ''),
+    ]
+    if summary['requests_per_minute'] is not None:
+        lines.append(f"Sustained over {summary['span_s']:.0f}s: {summary['requests_per_minute']:.1f} requests/min, "
+                     f"{summary['tokens_per_minute']:.0f} tokens/min")
+    if 'estimated_cost' in summary:
+        lines.append(f"Estimated cost: ${summary['estimated_cost']:.4f}")
+    return '\n'.join(lines)
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Summarize the Grok request telemetry log.")
+    parser.add_argument('log', nargs='?', default=os.getenv('GROK_TELEMETRY_LOG') or TELEMETRY_LOG,
+                        help="telemetry JSONL file")
+    parser.add_argument('--since', help="only requests at or after this ISO time, e.g. 2026-10-16T09:00")
+    parser.add_argument('--prompt-price', type=float, help="USD per million prompt tokens")
+    parser.add_argument('--completion-price', type=float, help="USD per million completion tokens")
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args()
+
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    try:
+        records = read_records(args.log, since)
+    except FileNotFoundError:
+        print(f"Error: {args.log} file not found!")
+        exit(1)
+    summary = summarize(records, args.prompt_price, args.completion_price)
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""Precompile a scene script's LaTeX in parallel into a shared Tex cache.
+
+Every MathTex/Tex in a scene compiles LaTeX and converts DVI to SVG the
+first time it is built, one after another, inside the render. This pre-pass
+finds the TeX the script will need, builds it on all cores before rendering
+starts, and stores the results in a cache directory that render workers and
+other machines can share:
+
+    python tex_pool.py quantum_field_theory_clean.py -j 8 --tex-dir /shared/manim-tex
+
+Manim names each .tex/.svg by a hash of the full LaTeX document, so the
+directory is content-addressed and safe to share between checkouts. Each
+expression is compiled in a private build directory and its files are
+renamed into place, so readers never see a half-written SVG. Renders pick
+the cache up through Manim's `tex_dir` setting (parallel_render.py sets it
+for you; for plain `manim` runs set `tex_dir` in manim.cfg).
+"""
+
+import argparse
+import ast
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+TEX_CACHE_DIR = os.getenv('MANIM_TEX_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'grok4', 'tex'))
+
+TEX_CLASSES = {'MathTex', 'Tex', 'SingleStringMathTex'}
+# Keyword arguments that change the LaTeX document; styling ones such as color don't
+TEX_KWARGS = {'arg_separator', 'tex_environment', 'substrings_to_isolate', 'tex_to_color_map'}
+
+
+@dataclass(frozen=True)
+class TexCall:
+    """A MathTex/Tex construction whose TeX is known before rendering."""
+    cls: str
+    args: tuple
+    kwargs: tuple = ()
+    lineno: int = field(default=0, compare=False)
+
+
+def _call_name(node):
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def collect_tex_calls(source):
+    """Find MathTex/Tex calls in a script whose TeX arguments are literals.
+
+    Calls built from runtime values (f-strings, variables) are skipped; they
+    are compiled during the render as usual.
+    """
+    calls = []
+    for node in ast.walk(ast.parse(source)):
+        if not (isinstance(node, ast.Call) and _call_name(node) in TEX_CLASSES):
+            continue
+        try:
+            args = tuple(ast.literal_eval(arg) for arg in node.args)
+            kwargs = []
+            for keyword in node.keywords:
+                if keyword.arg not in TEX_KWARGS:
+                    continue
+                if keyword.arg == 'tex_to_color_map':
+                    # Only the keys shape the document; colours are usually names like RED
+                    keys = ast.literal_eval(ast.List(elts=keyword.value.keys, ctx=ast.Load()))
+                    kwargs.append((keyword.arg, tuple((key, '#FFFFFF') for key in keys)))
+                else:
+                    value = ast.literal_eval(keyword.value)
+                    kwargs.append((keyword.arg, tuple(value) if isinstance(value, list) else value))
+        except (ValueError, TypeError, AttributeError, SyntaxError):
+            continue
+        if args and all(isinstance(arg, str) for arg in args):
+            calls.append(TexCall(_call_name(node), args, tuple(sorted(kwargs)), node.lineno))
+    return sorted(dict.fromkeys(calls), key=lambda call: call.lineno)
+
+
+def _call_kwargs(call):
+    kwargs = dict(call.kwargs)
+    if 'tex_to_color_map' in kwargs:
+        kwargs['tex_to_color_map'] = dict(kwargs['tex_to_color_map'])
+    if 'substrings_to_isolate' in kwargs:
+        kwargs['substrings_to_isolate'] = list(kwargs['substrings_to_isolate'])
+    return kwargs
+
+
+def compile_tex_call(call, tex_dir):
+    """Build one TeX call into tex_dir; returns None on success, else the error."""
+    import manim
+    from manim import config, tempconfig
+
+    template = config.tex_template
+    key = hashlib.sha256(repr((call.cls, call.args, call.kwargs, manim.__version__, template.tex_compiler,
+                               template.output_format, template.preamble)).encode('utf-8')).hexdigest()
+    marker = os.path.join(tex_dir, 'calls', key)
+    if os.path.exists(marker):
+        return None
+
+    work = tempfile.mkdtemp(prefix='.build-', dir=tex_dir)
+    try:
+        with tempconfig({'tex_dir': work}):
+            getattr(manim, call.cls)(*call.args, **_call_kwargs(call))
+        produced = [name for name in os.listdir(work) if name.endswith(('.tex', '.svg'))]
+        # .tex first: Manim treats an existing .svg as a complete cache entry
+        for name in sorted(produced, key=lambda name: name.endswith('.svg')):
+            os.replace(os.path.join(work, name), os.path.join(tex_dir, name))
+        os.makedirs(os.path.dirname(marker), exist_ok=True)
+        with open(marker + '.tmp', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(produced))
+        os.replace(marker + '.tmp', marker)
+        return None
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def precompile(calls, tex_dir=TEX_CACHE_DIR, workers=None):
+    """Compile TeX calls across a process pool; returns [(call, error or None)]."""
+    os.makedirs(tex_dir, exist_ok=True)
+    if not calls:
+        return []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        errors = pool.map(compile_tex_call, calls, [tex_dir] * len(calls))
+        return list(zip(calls, errors))
+
+
+def precompile_script(script, tex_dir=TEX_CACHE_DIR, workers=None):
+    with open(script, 'r', encoding='utf-8') as f:
+        return precompile(collect_tex_calls(f.read()), tex_dir, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompile a scene script's LaTeX into a shared cache.")
+    parser.add_argument('script', help="Manim script, e.g. quantum_field_theory_clean.py")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--tex-dir', default=TEX_CACHE_DIR, help="shared Tex cache directory")
+    args = parser.parse_args()
+
+    results = precompile_script(args.script, args.tex_dir, args.jobs)
+    failed = [(call, error) for call, error in results if error]
+    for call, error in failed:
+        print(f"line {call.lineno}: {call.cls}{call.args!r}: {error}")
+    print(f"Compiled {len(results) - len(failed)} of {len(results)} TeX expressions into '{args.tex_dir}'")
+    if failed:
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
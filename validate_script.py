@@ -0,0 +1,175 @@
+"""Check a generated scene script runs end to end without rendering it.
+
+Two stages, both a matter of seconds:
+
+1. byte-compile the script, catching syntax errors left by the model
+2. run construct() in a child process with Manim's dry_run config and every
+   animation skipped, so mobjects are built and every play()/wait() executes
+   but no frames are drawn or written
+
+A failure is reported with the scene method and line it happened in:
+
+    python validate_script.py manim_quantum_field_theory.py
+    python validate_script.py manim_quantum_field_theory.py --method scene_4_qed_lagrangian
+
+With --method, only that scene runs, after replaying the scenes it inherits
+mobjects from (see parallel_render.scene_dependencies).
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import traceback
+from dataclasses import asdict, dataclass
+
+from script_analyzer import method_at, method_spans
+from tex_pool import TEX_CACHE_DIR
+
+TIMEOUT = 300  # seconds
+
+
+@dataclass
+class ValidationResult:
+    ok: bool
+    stage: str = None         # "compile", "dry-run" or "timeout"
+    method: str = None
+    lineno: int = None
+    error: str = None
+    traceback: str = None
+
+
+def find_scene_class(source):
+    """Name of the first class deriving from a *Scene base, e.g. ThreeDScene."""
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                name = base.id if isinstance(base, ast.Name) else getattr(base, 'attr', '')
+                if name.endswith('Scene'):
+                    return node.name
+    return None
+
+
+def compile_check(source, filename):
+    try:
+        compile(source, filename, 'exec')
+    except SyntaxError as exc:
+        return ValidationResult(False, 'compile', lineno=exc.lineno, error=f"SyntaxError: {exc.msg}")
+    return ValidationResult(True)
+
+
+def _failure(exc, script, source):
+    # Attribute the error to the innermost frame inside the script itself
+    script = os.path.abspath(script)
+    frames = [frame for frame in traceback.extract_tb(exc.__traceback__)
+              if os.path.abspath(frame.filename) == script]
+    lineno = frames[-1].lineno if frames else None
+    method = method_at(method_spans(source), lineno) if lineno else None
+    return ValidationResult(False, 'dry-run', method, lineno, f"{type(exc).__name__}: {exc}",
+                            ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
+
+
+def dry_run(script, class_name, methods=None, tex_dir=TEX_CACHE_DIR):
+    """Run the scene (or only `methods`) with animations skipped, in this process."""
+    from manim import tempconfig
+    from parallel_render import load_scene_class, scene_dependencies, scene_methods
+
+    with open(script, 'r', encoding='utf-8') as f:
+        source = f.read()
+    try:
+        scene_cls = load_scene_class(script, class_name)
+        if methods is None:
+            plans = [None]
+        else:
+            deps = scene_dependencies(scene_cls, scene_methods(scene_cls))
+            plans = [deps.get(name, []) + [name] for name in methods]
+
+        for plan in plans:
+            class DryRun(scene_cls):
+                def construct(self):
+                    self.next_section("validate", skip_animations=True)
+                    if plan is None:
+                        scene_cls.construct(self)
+                    else:
+                        for name in plan:
+                            getattr(self, name)()
+
+            with tempconfig({"dry_run": True, "quality": "low_quality", "tex_dir": tex_dir}):
+                DryRun().render()
+    except Exception as exc:
+        return _failure(exc, script, source)
+    return ValidationResult(True)
+
+
+def validate(script, class_name=None, methods=None, timeout=TIMEOUT, tex_dir=TEX_CACHE_DIR):
+    """Byte-compile the script, then dry-run it in a child process."""
+    with open(script, 'r', encoding='utf-8') as f:
+        source = f.read()
+    result = compile_check(source, script)
+    if not result.ok:
+        return result
+    class_name = class_name or find_scene_class(source)
+    if class_name is None:
+        return ValidationResult(False, 'compile', error="No Scene subclass found in the script")
+
+    # A child process keeps Manim's global config and any hang in generated code contained
+    fd, result_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    command = [sys.executable, os.path.abspath(__file__), script, '--scene', class_name,
+               '--tex-dir', tex_dir, '--worker', result_path]
+    for name in methods or []:
+        command += ['--method', name]
+    process = None
+    try:
+        process = subprocess.run(command, timeout=timeout, capture_output=True)
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return ValidationResult(**json.load(f))
+    except subprocess.TimeoutExpired:
+        return ValidationResult(False, 'timeout', error=f"dry run did not finish within {timeout}s")
+    except (OSError, ValueError) as exc:
+        if process is None:
+            return ValidationResult(False, 'dry-run', error=f"could not start the validation worker: {exc}")
+        return ValidationResult(False, 'dry-run', error="validation worker crashed",
+                                traceback=process.stderr.decode('utf-8', errors='replace')[-4000:])
+    finally:
+        os.remove(result_path)
+
+
+def format_result(script, result):
+    if result.ok:
+        return f"{script}: OK"
+    where = f"{script}:{result.lineno}" if result.lineno else script
+    if result.method:
+        where += f" ({result.method})"
+    return f"{where}: {result.stage} failed: {result.error}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and dry-run a generated scene script.")
+    parser.add_argument('script', help="generated Manim script")
+    parser.add_argument('--scene', help="scene class (default: the first Scene subclass)")
+    parser.add_argument('--method', action='append', help="only run this scene method (repeatable)")
+    parser.add_argument('--timeout', type=int, default=TIMEOUT, help="seconds before the dry run is abandoned")
+    parser.add_argument('--tex-dir', default=TEX_CACHE_DIR, help="shared Tex cache directory")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = dry_run(args.script, args.scene, args.method, args.tex_dir)
+        with open(args.worker, 'w', encoding='utf-8') as f:
+            json.dump(asdict(result), f)
+        return
+
+    result = validate(args.script, args.scene, args.method, args.timeout, args.tex_dir)
+    print(format_result(args.script, result))
+    if not result.ok:
+        if result.traceback:
+            print(result.traceback)
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()